@@ -0,0 +1,49 @@
+"""
+Measures repeated access to ``url``, ``code`` and ``thumbnail`` of the same
+backend instance, as done by block form of ``{% video %}`` template tag,
+compared to the first access on a fresh instance.
+
+Run from repository root::
+
+    python benchmarks/bench_backend_properties.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import embed_video.tests  # noqa: F401 (sets up Django)
+from embed_video import backends
+from embed_video.backends import YoutubeBackend, clear_url_cache
+
+# Measure only local work, thumbnails are not checked by requests.
+backends.EMBED_VIDEO_YOUTUBE_CHECK_THUMBNAIL = False
+
+URL = "https://www.youtube.com/watch?v=jsrRJyHBvzw&feature=related"
+NUMBER = 20000
+
+
+def access(backend):
+    backend.url
+    backend.code
+    backend.thumbnail
+
+
+def cold():
+    clear_url_cache()
+    access(YoutubeBackend(URL))
+
+
+def main():
+    backend = YoutubeBackend(URL)
+    access(backend)
+    cold_time = min(timeit.repeat(cold, number=NUMBER, repeat=3))
+    warm_time = min(timeit.repeat(lambda: access(backend), number=NUMBER, repeat=3))
+    print("first access:    {:.2f}us".format(cold_time / NUMBER * 1e6))
+    print("repeated access: {:.2f}us".format(warm_time / NUMBER * 1e6))
+
+
+if __name__ == "__main__":
+    main()
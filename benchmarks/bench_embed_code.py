@@ -0,0 +1,48 @@
+"""
+Measures rendering of embed codes by the stock template without the template
+engine, compared to rendering of the same template by ``render_to_string``.
+
+Run from repository root::
+
+    python benchmarks/bench_embed_code.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import embed_video.tests  # noqa: F401 (sets up Django)
+from django.template.loader import render_to_string
+
+from embed_video.backends import YoutubeBackend
+
+URL = "https://www.youtube.com/watch?v=jsrRJyHBvzw&feature=related"
+NUMBER = 5000
+
+
+def main():
+    backend = YoutubeBackend(URL)
+    context = {"backend": backend, "width": 480, "height": 360}
+    assert backend.get_embed_code(480, 360) == render_to_string(
+        backend.template_name, context
+    )
+
+    fast_time = min(
+        timeit.repeat(lambda: backend.get_embed_code(480, 360), number=NUMBER, repeat=3)
+    )
+    template_time = min(
+        timeit.repeat(
+            lambda: render_to_string(backend.template_name, context),
+            number=NUMBER,
+            repeat=3,
+        )
+    )
+    print("{} embeds".format(NUMBER))
+    print("without template engine: {:.1f}ms".format(fast_time * 1e3))
+    print("render_to_string:        {:.1f}ms".format(template_time * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compares time of parsing YouTube and Vimeo codes from adversarial URLs by
+regular expressions used before (``re.search`` with nested optional groups)
+and by structured parsing in ``parse_code``.
+
+Run from repository root::
+
+    python benchmarks/bench_url_parsing.py
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import embed_video.tests  # noqa: F401 (sets up Django)
+from embed_video.backends import UnknownIdException, VimeoBackend, YoutubeBackend
+
+OLD_YOUTUBE_RE = re.compile(
+    r"""youtu(\.?)be(\.com)?/(\#/)?(embed/)?(v/)?(shorts/)?(watch\?v=)?
+        (ytscreeningroom\?v=)?(feeds/api/videos/)?(user\S*[^\w\-\s])?
+        (?P<code>[\w\-]{11})[a-z0-9;:@?&%=+/\$_.-]*""",
+    re.I | re.X,
+)
+OLD_VIMEO_RE = re.compile(
+    r"vimeo\.com/(video/)?(channels/(.*/)?)?((.+)/review/)?(manage/)?(?P<code>[0-9]+)",
+    re.I,
+)
+
+CASES = (
+    (
+        "youtube",
+        lambda n: "https://youtube.com/" + "youtube.com/user!" * n,
+        OLD_YOUTUBE_RE,
+        YoutubeBackend,
+    ),
+    (
+        "vimeo",
+        lambda n: "https://vimeo.com/" + "vimeo.com/a" * n,
+        OLD_VIMEO_RE,
+        VimeoBackend,
+    ),
+)
+
+
+def parse(backend, url):
+    try:
+        backend.parse_code(url)
+    except UnknownIdException:
+        pass
+
+
+def main():
+    print(
+        "{:<8} {:>7} {:>12} {:>12}".format("backend", "length", "regex", "parse_code")
+    )
+    for name, make_url, old_re, backend in CASES:
+        for n in (125, 250, 500, 1000):
+            url = make_url(n)
+            old = min(timeit.repeat(lambda: old_re.search(url), number=1, repeat=3))
+            new = min(timeit.repeat(lambda: parse(backend, url), number=1, repeat=3))
+            print(
+                "{:<8} {:>7} {:>10.2f}ms {:>10.2f}ms".format(
+                    name, len(url), old * 1000, new * 1000
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
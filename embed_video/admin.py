@@ -1,13 +1,14 @@
+import copy
+
+import requests
 from django import forms
 from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
+from django.utils.html import format_html
 from django.utils.safestring import mark_safe
+from django.utils.translation import gettext_lazy as _
 
-from embed_video.backends import (
-    UnknownBackendException,
-    VideoDoesntExistException,
-    detect_backend,
-)
+from embed_video.backends import EmbedVideoException, detect_backend
 from embed_video.fields import EmbedVideoField
 
 
@@ -17,6 +18,14 @@ class AdminVideoWidget(forms.TextInput):
     :py:class:`django.forms.TextInput`. Otherwise it renders embedded video
     together with input field.
 
+    In facade mode only thumbnail of video with play button is rendered and
+    the player is loaded after click, so forms with many videos don't load
+    all players at once.
+
+    Backends detected during validation by
+    :py:class:`~embed_video.fields.EmbedVideoFormField` are stored in
+    :py:data:`backends` and reused for rendering.
+
     .. todo::
 
         Django 1.6 provides better parent for this widget -
@@ -30,18 +39,85 @@ class AdminVideoWidget(forms.TextInput):
         '<hr style="visibility: hidden; clear:both">'
     )
 
-    def __init__(self, attrs=None):
+    facade_format = (
+        '<div class="video-facade" style="width:{width}px;height:{height}px">'
+        "{thumbnail}"
+        '<button type="button" class="video-facade-play" aria-label="{label}">'
+        "&#9654;</button>"
+        "<template>{video}</template></div>"
+    )
+
+    def __init__(self, attrs=None, facade=False):
         """
         :type attrs: dict
+        :param facade: Render thumbnail instead of player.
+        :type facade: bool
         """
         default_attrs = {"size": "40"}
         self.validator = URLValidator()
+        self.facade = facade
+        self.backends = {}
 
         if attrs:
             default_attrs.update(attrs)
 
         super().__init__(default_attrs)
 
+    def __deepcopy__(self, memo):
+        obj = super().__deepcopy__(memo)
+        # Each form has its own detected backends.
+        obj.backends = {}
+        return obj
+
+    @property
+    def media(self):
+        if not self.facade:
+            return forms.Media()
+        return forms.Media(
+            css={"all": ["embed_video/admin_facade.css"]},
+            js=["embed_video/admin_facade.js"],
+        )
+
+    def get_backend(self, url):
+        """
+        Returns backend detected during validation or detects it.
+
+        :type url: str
+        :rtype: embed_video.backends.VideoBackend
+        """
+        backend = self.backends.get(url)
+        if backend is None:
+            self.validator(url)
+            backend = detect_backend(url)
+        return backend
+
+    def render_facade(self, backend, size):
+        """
+        Returns thumbnail of video with play button. The player is loaded
+        after click.
+
+        :type backend: embed_video.backends.VideoBackend
+        :type size: tuple[int, int]
+        :rtype: str
+        """
+        width, height = size
+        try:
+            thumbnail = backend.get_lite_thumbnail_url()
+        except (EmbedVideoException, requests.RequestException):
+            thumbnail = None
+        return format_html(
+            self.facade_format,
+            width=width,
+            height=height,
+            thumbnail=(
+                format_html('<img src="{0}" alt="" loading="lazy">', thumbnail)
+                if thumbnail
+                else ""
+            ),
+            label=_("Play video"),
+            video=mark_safe(backend.get_embed_code(*size)),
+        )
+
     def render(self, name, value="", attrs=None, size=(420, 315), renderer=None):
         """
         :type name: str
@@ -54,14 +130,15 @@ class AdminVideoWidget(forms.TextInput):
             return output
 
         try:
-            self.validator(value)
-            backend = detect_backend(value)
-            return mark_safe(
-                self.output_format.format(
-                    video=backend.get_embed_code(*size), input=output
-                )
+            backend = self.get_backend(value)
+            video = (
+                self.render_facade(backend, size)
+                if self.facade
+                else backend.get_embed_code(*size)
             )
-        except (UnknownBackendException, ValidationError, VideoDoesntExistException):
+            return mark_safe(self.output_format.format(video=video, input=output))
+        except (ValidationError, EmbedVideoException, requests.RequestException):
+            # Eg. unknown URL or unavailable provider, only the input is shown.
             return output
 
 
@@ -81,6 +158,15 @@ class AdminVideoMixin:
 
         admin.site.register(MyModel, MyModelAdmin)
 
+    Set :py:data:`video_facade` to render thumbnails instead of players.
+
+    """
+
+    video_facade = False
+    """
+    Render videos in :py:class:`AdminVideoWidget` in facade mode.
+
+    :type: bool
     """
 
     def formfield_for_dbfield(self, db_field, **kwargs):
@@ -88,6 +174,6 @@ class AdminVideoMixin:
         :type db_field: str
         """
         if isinstance(db_field, EmbedVideoField):
-            return db_field.formfield(widget=AdminVideoWidget)
+            return db_field.formfield(widget=AdminVideoWidget(facade=self.video_facade))
 
         return super().formfield_for_dbfield(db_field, **kwargs)
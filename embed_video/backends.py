@@ -1,21 +1,40 @@
+import copy
+import functools
 import json
+import os
 import re
 import urllib.parse as urlparse
 
 import requests
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.signals import setting_changed
 from django.http import QueryDict
-from django.template.loader import render_to_string
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template, render_to_string
+from django.utils.formats import localize
 from django.utils.functional import cached_property
+from django.utils.html import conditional_escape
 from django.utils.module_loading import import_string
-from django.utils.safestring import mark_safe
+from django.utils.safestring import SafeString, mark_safe
+from django.utils.timezone import template_localtime
 
+from embed_video import cache, http, utils
 from embed_video.settings import (
     EMBED_VIDEO_BACKENDS,
+    EMBED_VIDEO_CIRCUIT_BREAKER_COOLDOWN,
+    EMBED_VIDEO_CIRCUIT_BREAKER_FAILURE_RATE,
+    EMBED_VIDEO_CIRCUIT_BREAKER_WINDOW,
+    EMBED_VIDEO_MAX_URL_LENGTH,
     EMBED_VIDEO_TIMEOUT,
+    EMBED_VIDEO_URL_CACHE_SIZE,
     EMBED_VIDEO_YOUTUBE_CHECK_THUMBNAIL,
+    EMBED_VIDEO_YOUTUBE_CHECK_THUMBNAIL_CONCURRENTLY,
     EMBED_VIDEO_YOUTUBE_DEFAULT_QUERY,
 )
 
+_missing = object()
+
 
 class EmbedVideoException(Exception):
     """Parental class for all embed_video exceptions"""
@@ -43,12 +62,297 @@ class UnknownIdException(VideoDoesntExistException):
     pass
 
 
+class ProviderUnavailableException(EmbedVideoException):
+    """
+    Exception thrown instead of request to remote server while circuit breaker
+    of the backend is open.
+    """
+
+    pass
+
+
+@functools.lru_cache(maxsize=None)
+def get_circuit_breaker(backend_class):
+    """
+    Returns circuit breaker shared by requests of backend class or ``None`` if
+    :setting:`EMBED_VIDEO_CIRCUIT_BREAKER_FAILURE_RATE` isn't set.
+
+    :type backend_class: type[VideoBackend]
+    :rtype: embed_video.utils.CircuitBreaker | None
+    """
+    if EMBED_VIDEO_CIRCUIT_BREAKER_FAILURE_RATE is None:
+        return None
+    return utils.CircuitBreaker(
+        EMBED_VIDEO_CIRCUIT_BREAKER_FAILURE_RATE,
+        window=EMBED_VIDEO_CIRCUIT_BREAKER_WINDOW,
+        cooldown=EMBED_VIDEO_CIRCUIT_BREAKER_COOLDOWN,
+    )
+
+
+def normalize_hostname(hostname):
+    """
+    Returns lowercased hostname without ``www.`` and ``m.`` prefixes.
+
+    :type hostname: str
+    :rtype: str
+    """
+    hostname = hostname.lower()
+    for prefix in ("www.", "m."):
+        if hostname.startswith(prefix):
+            return hostname[len(prefix) :]
+    return hostname
+
+
+def get_hostname(url):
+    """
+    Returns normalized hostname of URL (which may miss the scheme) or ``None``.
+
+    :type url: str
+    :rtype: str | None
+    """
+    if "://" not in url and not url.startswith("//"):
+        url = "//" + url
+    try:
+        hostname = urlparse.urlsplit(url).hostname
+    except ValueError:
+        return None
+    return normalize_hostname(hostname) if hostname else None
+
+
+def split_url(url):
+    """
+    Splits URL (which may miss the scheme) to normalized hostname, non-empty
+    path segments, query parameters and fragment. It runs in linear time
+    regardless of the input.
+
+    :type url: str
+    :rtype: tuple[str, list[str], dict[str, list[str]], str]
+    """
+    if "://" not in url and not url.startswith("//"):
+        url = "//" + url
+    try:
+        parts = urlparse.urlsplit(url)
+        hostname = parts.hostname
+    except ValueError:
+        return "", [], {}, ""
+    return (
+        normalize_hostname(hostname) if hostname else "",
+        [segment for segment in parts.path.split("/") if segment],
+        urlparse.parse_qs(parts.query),
+        parts.fragment,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_backend_index(backend_names):
+    """
+    Imports backends and indexes them by their
+    :py:data:`~VideoBackend.hostnames`. Result is cached for each tuple of
+    backend names.
+
+    :type backend_names: tuple[str]
+    :return: All backends and mapping of hostname to backends which may
+        handle it, both in the order of ``backend_names``.
+    :rtype: tuple[list[type[VideoBackend]], dict[str, list[type[VideoBackend]]]]
+    """
+    backends = [import_string(backend_name) for backend_name in backend_names]
+    hostnames = {
+        normalize_hostname(hostname)
+        for backend in backends
+        for hostname in backend.hostnames
+    }
+    index = {
+        hostname: [
+            backend
+            for backend in backends
+            if not backend.hostnames
+            or hostname in map(normalize_hostname, backend.hostnames)
+        ]
+        for hostname in hostnames
+    }
+    return backends, index
+
+
+def get_backend_names():
+    """
+    Returns current value of :setting:`EMBED_VIDEO_BACKENDS`.
+
+    :rtype: tuple[str]
+    """
+    return tuple(getattr(settings, "EMBED_VIDEO_BACKENDS", EMBED_VIDEO_BACKENDS))
+
+
+@functools.lru_cache(maxsize=EMBED_VIDEO_URL_CACHE_SIZE)
+def _detect_backend_class(backend_names, url):
+    backends, index = get_backend_index(backend_names)
+    hostname = get_hostname(url)
+    candidates = index.get(hostname, backends) if hostname else backends
+
+    for backend in candidates:
+        if backend.is_valid(url):
+            return backend
+    return None
+
+
+@functools.lru_cache(maxsize=EMBED_VIDEO_URL_CACHE_SIZE)
+def _parse_code(backend, url):
+    try:
+        return backend.parse_code(url), None
+    except UnknownIdException as e:
+        return None, e
+
+
+def get_url_cache_info():
+    """
+    Returns statistics of in-process caches of detected backends and parsed
+    codes. Their size is limited by :setting:`EMBED_VIDEO_URL_CACHE_SIZE`.
+
+    :rtype: dict[str, functools._CacheInfo]
+    """
+    return {
+        "backends": _detect_backend_class.cache_info(),
+        "codes": _parse_code.cache_info(),
+    }
+
+
+def clear_url_cache():
+    """
+    Clears in-process caches of detected backends and parsed codes.
+    """
+    _detect_backend_class.cache_clear()
+    _parse_code.cache_clear()
+
+
+STOCK_TEMPLATE_NAME = "embed_video/embed_code.html"
+
+STOCK_TEMPLATE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "templates", STOCK_TEMPLATE_NAME
+)
+
+# Markup of STOCK_TEMPLATE_NAME with placeholders for width, height and url.
+STOCK_EMBED_CODE = (
+    '<iframe width="{0}" height="{1}" src="{2}" loading="lazy" frameborder="0" '
+    'allowfullscreen referrerpolicy="strict-origin-when-cross-origin"></iframe>\n'
+)
+
+
+@functools.lru_cache(maxsize=None)
+def uses_stock_template(template_name):
+    """
+    Returns ``True`` if ``template_name`` is loaded from the stock template
+    shipped with embed_video, ie. the project doesn't override it.
+
+    :type template_name: str
+    :rtype: bool
+    """
+    if template_name != STOCK_TEMPLATE_NAME:
+        return False
+    try:
+        origin = get_template(template_name).origin.name
+    except (TemplateDoesNotExist, AttributeError):
+        return False
+    return os.path.abspath(str(origin)) == STOCK_TEMPLATE_PATH
+
+
+def _render_value(value):
+    # Same conversions as variables in Django templates get. Integers are
+    # only changed by localization if thousand separator is used.
+    if type(value) is int and not settings.USE_THOUSAND_SEPARATOR:
+        return str(value)
+    if not isinstance(value, str):
+        value = str(localize(template_localtime(value)))
+    return conditional_escape(value)
+
+
+def render_stock_embed_code(url, width, height):
+    """
+    Returns the same output as rendering of stock template
+    ``embed_video/embed_code.html``, without the template engine.
+
+    :type url: str
+    :type width: int | str
+    :type height: int | str
+    :rtype: django.utils.safestring.SafeText
+    """
+    return mark_safe(
+        STOCK_EMBED_CODE.format(
+            _render_value(width), _render_value(height), _render_value(url)
+        )
+    )
+
+
+class DegradedCode(SafeString):
+    """
+    Embed code rendered without data which couldn't be fetched (eg. thumbnail
+    in :py:meth:`VideoBackend.get_lite_code`). It isn't stored in
+    :setting:`EMBED_VIDEO_FRAGMENT_CACHE`.
+    """
+
+
+def css_length(value):
+    """
+    Returns embed code size as CSS length, numbers are taken as pixels.
+
+    :type value: int | str
+    :rtype: str
+    """
+    value = str(value)
+    return value if value.endswith("%") else value + "px"
+
+
+def response_exists(response):
+    """
+    Decides by status code of response to request for video data if the
+    video exists. Status codes which don't tell it (eg. server errors or rate
+    limiting) raise :py:exc:`requests.HTTPError`.
+
+    :type response: requests.Response
+    :rtype: bool
+    """
+    if response.status_code < 400:
+        return True
+    if response.status_code in (404, 410):
+        return False
+    response.raise_for_status()
+    return False
+
+
+def _setting_changed(setting, **kwargs):
+    if setting == "EMBED_VIDEO_BACKENDS":
+        clear_url_cache()
+    elif setting in ("TEMPLATES", "INSTALLED_APPS"):
+        uses_stock_template.cache_clear()
+
+
+setting_changed.connect(_setting_changed)
+
+
+def detect_backend_class(url):
+    """
+    Returns class of backend for given URL, see :py:func:`detect_backend`.
+
+    :type url: str
+    :rtype: type[VideoBackend]
+    """
+    if len(url) > EMBED_VIDEO_MAX_URL_LENGTH:
+        raise UnknownBackendException
+    backend = _detect_backend_class(get_backend_names(), url)
+    if backend is None:
+        raise UnknownBackendException
+    return backend
+
+
 def detect_backend(url):
     """
     Detect the right backend for given URL.
 
-    Goes over backends in ``settings.EMBED_VIDEO_BACKENDS``,
-    calls :py:func:`~VideoBackend.is_valid` and returns backend instance.
+    Goes over backends in ``settings.EMBED_VIDEO_BACKENDS`` which may handle
+    hostname of the URL (see :py:data:`~VideoBackend.hostnames`), calls
+    :py:func:`~VideoBackend.is_valid` and returns backend instance. If no
+    backend declares the hostname, all backends are tried. Results are
+    cached for recently used URLs (see :py:func:`get_url_cache_info`).
+    URLs longer than :setting:`EMBED_VIDEO_MAX_URL_LENGTH` are never
+    recognized.
 
     :param url: URL which is passed to `is_valid` methods of VideoBackends.
     :type url: str
@@ -56,13 +360,18 @@ def detect_backend(url):
     :return: Returns recognized VideoBackend
     :rtype: VideoBackend
     """
+    return detect_backend_class(url)(url)
 
-    for backend_name in EMBED_VIDEO_BACKENDS:
-        backend = import_string(backend_name)
-        if backend.is_valid(url):
-            return backend(url)
 
-    raise UnknownBackendException
+async def adetect_backend(url):
+    """
+    Asynchronous version of :py:func:`detect_backend`. Detection doesn't
+    send any requests, so it never blocks the event loop.
+
+    :type url: str
+    :rtype: VideoBackend
+    """
+    return detect_backend(url)
 
 
 class VideoBackend:
@@ -82,6 +391,7 @@ class VideoBackend:
         is_secure
         protocol
         template_name
+        lite_template_name
 
 
     .. code-block:: python
@@ -106,6 +416,27 @@ class VideoBackend:
     Example: ``re.compile(r'^http://myvideo\\.com/.*')``
     """
 
+    hostnames = ()
+    """
+    Hostnames of URLs valid for current backend, ``www.`` and ``m.``
+    prefixes are ignored. :py:func:`detect_backend` tries backend only for
+    these hostnames. If empty, backend is tried for all URLs.
+
+    Example: ``("myvideo.com",)``
+
+    :type: tuple[str]
+    """
+
+    provider_name = None
+    """
+    Name of video provider stored by
+    :py:class:`~embed_video.fields.EmbedVideoField` with ``provider_field``.
+    If ``None``, it is derived from class name (eg. ``youtube`` for
+    ``YoutubeBackend``), see :py:meth:`get_provider_name`.
+
+    :type: str | None
+    """
+
     pattern_url = None
     """
     Pattern in which the code is inserted.
@@ -115,6 +446,17 @@ class VideoBackend:
     :type: str
     """
 
+    preconnect_origins = None
+    """
+    Origins of player and thumbnails the browser connects to, used by
+    :py:class:`~embed_video.hints.ResourceHintsMiddleware`. If ``None``, the
+    origin of :py:data:`pattern_url` is used.
+
+    Example: ``("https://player.myvideo.com", "https://img.myvideo.com")``
+
+    :type: tuple[str] | None
+    """
+
     pattern_thumbnail_url = None
     """
     Pattern in which the code is inserted to get thumbnail url.
@@ -131,7 +473,7 @@ class VideoBackend:
     :type: bool
     """
 
-    template_name = "embed_video/embed_code.html"
+    template_name = STOCK_TEMPLATE_NAME
     """
     Name of embed code template used by :py:meth:`get_embed_code`.
 
@@ -141,6 +483,25 @@ class VideoBackend:
     :type: str
     """
 
+    lite_template_name = "embed_video/lite_code.html"
+    """
+    Name of template used by :py:meth:`get_lite_code`.
+
+    Passed template variables: ``{{ backend }}`` (instance of VideoBackend),
+    ``{{ width }}``, ``{{ height }}`` (CSS lengths), ``{{ thumbnail }}`` and
+    ``{{ embed_code }}`` (the player loaded after click)
+
+    :type: str
+    """
+
+    autoplay_query = "autoplay=1"
+    """
+    Query string added to player URL in :py:meth:`get_lite_code`, so the
+    player starts right after click. ``None`` if provider doesn't support it.
+
+    :type: str | None
+    """
+
     default_query = ""
     """
     Default query string or `QueryDict` appended to url
@@ -155,10 +516,35 @@ class VideoBackend:
     :type: bool
     """
 
+    cache_timeout = None
+    """
+    Number of seconds :py:data:`info` is cached for. If ``None``,
+    :setting:`EMBED_VIDEO_CACHE_TIMEOUT` is used.
+
+    :type: int | None
+    """
+
+    negative_cache_timeout = None
+    """
+    Number of seconds the information that video doesn't exist is cached for.
+    If ``None``, :setting:`EMBED_VIDEO_CACHE_NEGATIVE_TIMEOUT` is used.
+
+    :type: int | None
+    """
+
+    stale_cache_timeout = None
+    """
+    Number of seconds expired :py:data:`info` is still returned while it is
+    refreshed in background. If ``None``,
+    :setting:`EMBED_VIDEO_CACHE_STALE_TIMEOUT` is used.
+
+    :type: int | None
+    """
+
     def __init__(self, url):
         """
-        First it tries to load data from cache and if it don't succeed, run
-        :py:meth:`init` and then save it to cache.
+        Data fetched from remote servers (:py:data:`info`) are loaded from
+        cache set by :setting:`EMBED_VIDEO_CACHE` when possible.
 
         :type url: str
         """
@@ -166,19 +552,53 @@ class VideoBackend:
         self._url = url
         self.query = QueryDict(self.default_query, mutable=True)
 
+    def __setattr__(self, name, value):
+        # Derived values depend on public attributes, eg. query, is_secure or
+        # options passed to set_options(). Class attributes are compared
+        # without calling descriptors, which could make requests, except
+        # settable properties like query.
+        changed = False
+        if not name.startswith("_"):
+            current = self.__dict__.get(name, getattr(type(self), name, _missing))
+            if isinstance(current, property) and current.fset is not None:
+                current = getattr(self, name, _missing)
+            changed = current != value
+        super().__setattr__(name, value)
+        if changed:
+            self.__dict__.pop("_derived", None)
+
+    def __copy__(self):
+        # Copy shares fetched data, but not query and derived values, which
+        # change with its options.
+        backend = self.__class__.__new__(self.__class__)
+        backend.__dict__.update(self.__dict__)
+        backend.__dict__["_query"] = self.query.copy()
+        backend.__dict__["_derived"] = dict(self.__dict__.get("_derived", {}))
+        return backend
+
+    def _get_derived(self, name, getter):
+        derived = self.__dict__.setdefault("_derived", {})
+        if name not in derived:
+            derived[name] = getter()
+        return derived[name]
+
     @property
     def code(self):
         """
-        Code of video.
+        Code of video. It depends on given url only, so it is computed once
+        for the lifetime of backend.
         """
-        return self.get_code()
+        if "_code" not in self.__dict__:
+            self._code = self.get_code()
+        return self._code
 
     @property
     def url(self):
         """
-        URL of video.
+        URL of video. It is computed only once until any public attribute of
+        backend (eg. :py:data:`query`) is set.
         """
-        return self.get_url()
+        return self._get_derived("url", self.get_url)
 
     @property
     def protocol(self):
@@ -190,21 +610,27 @@ class VideoBackend:
     @property
     def thumbnail(self):
         """
-        URL of video thumbnail.
+        URL of video thumbnail. It is computed only once until any public
+        attribute of backend (eg. :py:data:`is_secure`) is set.
         """
-        return self.get_thumbnail_url()
+        return self._get_derived("thumbnail", self.get_thumbnail_url)
 
-    @property
+    @cached_property
     def info(self):
         """
         Additional information about video. Not implemented in all backends.
+
+        It is fetched only once per instance. Result of :py:meth:`get_info` is
+        also cached if :setting:`EMBED_VIDEO_CACHE` is set.
         """
-        return self.get_info()
+        return self.get_cached("info", self.get_info)
 
     @property
     def query(self):
         """
-        String transformed to QueryDict appended to url.
+        String transformed to QueryDict appended to url. Assign new value
+        instead of changing the returned QueryDict, so :py:data:`url` is
+        updated.
         """
         return self._query
 
@@ -227,16 +653,61 @@ class VideoBackend:
         """
         return True if cls.re_detect.match(url) else False
 
-    def get_code(self):
+    @classmethod
+    def parse_code(cls, url):
         """
-        Returns video code matched from given url by :py:data:`re_code`.
+        Class method returning video code matched from given url by
+        :py:data:`re_code`.
 
+        :type url: str
         :rtype: str
         """
-        match = self.re_code.search(self._url)
+        match = cls.re_code.search(url)
         if match:
             return match.group("code")
 
+    @classmethod
+    def get_preconnect_origins(cls):
+        """
+        Returns :py:data:`preconnect_origins` or origin of HTTPS version of
+        :py:data:`pattern_url`.
+
+        :rtype: tuple[str]
+        """
+        if cls.preconnect_origins is not None:
+            return cls.preconnect_origins
+        if not cls.pattern_url:
+            return ()
+        scheme, netloc, _, _, _ = urlparse.urlsplit(
+            cls.pattern_url.format(protocol="https", code="")
+        )
+        return ("{0}://{1}".format(scheme, netloc),) if netloc else ()
+
+    @classmethod
+    def has_local_code(cls):
+        """
+        Returns ``True`` if code is parsed from URL by :py:meth:`parse_code`,
+        without requests to remote server. Backends overriding
+        :py:meth:`get_code` may need remote data.
+
+        :rtype: bool
+        """
+        return cls.get_code is VideoBackend.get_code
+
+    def get_code(self):
+        """
+        Returns video code parsed from given url by :py:meth:`parse_code`.
+        Results are cached for recently used URLs.
+
+        :rtype: str
+        """
+        if len(self._url) > EMBED_VIDEO_MAX_URL_LENGTH:
+            raise UnknownIdException("URL `{0}...` is too long".format(self._url[:50]))
+        code, error = _parse_code(type(self), self._url)
+        if error is not None:
+            raise type(error)(*error.args)
+        return code
+
     def get_url(self):
         """
         Returns URL folded from :py:data:`pattern_url` and parsed code.
@@ -254,24 +725,232 @@ class VideoBackend:
         """
         return self.pattern_thumbnail_url.format(code=self.code, protocol=self.protocol)
 
+    def get_lite_thumbnail_url(self):
+        """
+        Returns thumbnail URL used by :py:meth:`get_lite_code` and facade of
+        :py:class:`~embed_video.admin.AdminVideoWidget`. By default it is
+        :py:data:`thumbnail`.
+
+        :rtype: str | None
+        """
+        return self.thumbnail
+
+    async def aget_thumbnail_url(self):
+        """
+        Asynchronous version of :py:meth:`get_thumbnail_url`. By default
+        :py:meth:`get_thumbnail_url` is run in a thread.
+
+        :rtype: str
+        """
+        return await sync_to_async(self.get_thumbnail_url, thread_sensitive=False)()
+
     def get_embed_code(self, width, height):
         """
         Returns embed code rendered from template :py:data:`template_name`.
+        Stock template which isn't overridden by project is rendered without
+        the template engine.
 
         :type width: int | str
         :type height: int | str
         :rtype: str
         """
+        if uses_stock_template(self.template_name):
+            return render_stock_embed_code(self.url, width, height)
         return render_to_string(
             self.template_name, {"backend": self, "width": width, "height": height}
         )
 
+    def get_lite_code(self, width, height):
+        """
+        Returns lightweight embed code rendered from template
+        :py:data:`lite_template_name` - thumbnail with play button, which is
+        replaced with the player after click. Thumbnail URL is returned by
+        :py:meth:`get_lite_thumbnail_url`. If it can't be fetched, the play
+        button is rendered without thumbnail and :py:class:`DegradedCode` is
+        returned.
+
+        :type width: int | str
+        :type height: int | str
+        :rtype: str
+        """
+        degraded = False
+        try:
+            thumbnail = self.get_lite_thumbnail_url()
+        except (EmbedVideoException, requests.RequestException):
+            thumbnail = None
+            degraded = True
+
+        player = self
+        if self.autoplay_query:
+            player = copy.copy(self)
+            query = self.query.copy()
+            for key, values in QueryDict(self.autoplay_query).lists():
+                query.setlist(key, values)
+            player.query = query
+
+        code = render_to_string(
+            self.lite_template_name,
+            {
+                "backend": self,
+                "width": css_length(width),
+                "height": css_length(height),
+                "thumbnail": thumbnail,
+                "embed_code": player.get_embed_code(width, height),
+            },
+        )
+        return DegradedCode(code) if degraded else code
+
+    async def aget_embed_code(self, width, height):
+        """
+        Asynchronous version of :py:meth:`get_embed_code`. By default
+        :py:meth:`get_embed_code` is run in a thread.
+
+        :type width: int | str
+        :type height: int | str
+        :rtype: str
+        """
+        return await sync_to_async(self.get_embed_code, thread_sensitive=False)(
+            width, height
+        )
+
     def get_info(self):
         """
+        Backends have to implement :py:meth:`get_info` or :py:meth:`aget_info`.
+        If only :py:meth:`aget_info` is implemented, it is called from here.
+
         :rtype: dict
         """
+        if type(self).aget_info is not VideoBackend.aget_info:
+            return async_to_sync(self.aget_info)()
         raise NotImplementedError
 
+    def exists(self):
+        """
+        Checks on remote server if video still exists. Unlike
+        :py:data:`info`, result is never cached. By default it is decided by
+        :py:meth:`get_info`.
+
+        :rtype: bool
+        """
+        try:
+            self.get_info()
+        except VideoDoesntExistException:
+            return False
+        return True
+
+    async def aget_info(self):
+        """
+        Asynchronous version of :py:meth:`get_info`. By default
+        :py:data:`info` is loaded in a thread, so the result is cached the same
+        way (and guarded by :py:meth:`call_remote`).
+
+        :rtype: dict
+        """
+        return await sync_to_async(lambda: self.info, thread_sensitive=False)()
+
+    @classmethod
+    def get_provider_name(cls):
+        """
+        Returns :py:data:`provider_name` or lowercased class name without
+        ``Backend`` suffix.
+
+        :rtype: str
+        """
+        if cls.provider_name:
+            return cls.provider_name
+        name = cls.__name__.lower()
+        if name.endswith("backend") and name != "backend":
+            name = name[: -len("backend")]
+        return name
+
+    def get_cache_key(self):
+        """
+        Returns identifier of video used in cache keys. Videos with the same
+        identifier share cached data.
+
+        :rtype: str
+        """
+        return self._url
+
+    def get_cached(self, kind, fetch):
+        """
+        Returns result of ``fetch`` cached in :setting:`EMBED_VIDEO_CACHE`.
+        :py:class:`VideoDoesntExistException` is cached too, for
+        :py:data:`negative_cache_timeout` seconds. Expired result is refreshed
+        in background during :py:data:`stale_cache_timeout`.
+
+        ``fetch`` is called by :py:meth:`call_remote`, so cached result is
+        still returned while circuit breaker of the backend is open.
+
+        :param kind: Type of cached data (eg. ``info``).
+        :type kind: str
+        :type fetch: callable
+        """
+        return cache.get_or_fetch(
+            cache.make_key(kind, self.backend, self.get_cache_key()),
+            functools.partial(self.call_remote, fetch),
+            timeout=self.cache_timeout,
+            negative_timeout=self.negative_cache_timeout,
+            negative_exceptions=(VideoDoesntExistException,),
+            stale_timeout=self.stale_cache_timeout,
+        )
+
+    def peek_cached(self, kind, default=None):
+        """
+        Returns data cached by :py:meth:`get_cached` without fetching them,
+        or ``default`` if they aren't cached.
+
+        :param kind: Type of cached data (eg. ``info``).
+        :type kind: str
+        """
+        return cache.peek(
+            cache.make_key(kind, self.backend, self.get_cache_key()), default
+        )
+
+    def call_remote(self, fn, *args, **kwargs):
+        """
+        Returns ``fn(*args, **kwargs)`` which makes requests to remote server,
+        guarded by circuit breaker of the backend class (see
+        :setting:`EMBED_VIDEO_CIRCUIT_BREAKER_FAILURE_RATE`). Only
+        :py:exc:`requests.RequestException` counts as failure, spent
+        :py:func:`~embed_video.http.budget` doesn't. Only returned result and
+        :py:exc:`VideoDoesntExistException` count as success.
+
+        :type fn: callable
+        :raises ProviderUnavailableException: if the circuit is open.
+        """
+        breaker = get_circuit_breaker(type(self))
+        if breaker is None:
+            return fn(*args, **kwargs)
+        remaining = http.get_remaining_budget()
+        if remaining is not None and remaining <= 0:
+            # Trial call of half-open circuit isn't wasted on spent budget.
+            raise http.BudgetExceededException("Time budget of requests is spent.")
+        if not breaker.allow():
+            raise ProviderUnavailableException(
+                "Requests to `{0}` are suspended.".format(self.get_provider_name())
+            )
+
+        try:
+            result = fn(*args, **kwargs)
+        except http.BudgetExceededException:
+            # It isn't failure of the remote server.
+            breaker.cancel()
+            raise
+        except requests.RequestException:
+            breaker.record(False)
+            raise
+        except VideoDoesntExistException:
+            # Server responded, the video is missing.
+            breaker.record(True)
+            raise
+        except BaseException:
+            # Neither success nor failure of the remote server.
+            breaker.cancel()
+            raise
+        breaker.record(True)
+        return result
+
     def set_options(self, options):
         """
         :type options: dict
@@ -286,23 +965,21 @@ class YoutubeBackend(VideoBackend):
     """
 
     re_detect = re.compile(r"^(http(s)?://)?(www\.|m\.)?youtu(\.?)be(\.com)?/.*", re.I)
+    hostnames = ("youtube.com", "youtu.be")
 
-    re_code = re.compile(
-        r"""youtu(\.?)be(\.com)?/  # match youtube's domains
-            (\#/)? # for mobile urls
-            (embed/)?  # match the embed url syntax
-            (v/)?
-            (shorts/)? # match youtube shorts
-            (watch\?v=)?  # match the youtube page url
-            (ytscreeningroom\?v=)?
-            (feeds/api/videos/)?
-            (user\S*[^\w\-\s])?
-            (?P<code>[\w\-]{11})[a-z0-9;:@?&%=+/\$_.-]*  # match and extract
-        """,
-        re.I | re.X,
-    )
+    re_code = re.compile(r"[\w\-]{11}")
+    """
+    Compiled regex matching beginning of path segment or parameter containing
+    video code. Code is found by :py:meth:`parse_code` in structure of URL.
+    """
+
+    code_prefixes = ("embed", "v", "shorts")
+    """
+    Path segments followed by video code.
+    """
 
     pattern_url = "{protocol}://www.youtube.com/embed/{code}"
+    preconnect_origins = ("https://www.youtube.com", "https://img.youtube.com")
     pattern_thumbnail_url = "{protocol}://img.youtube.com/vi/{code}/{resolution}"
     default_query = EMBED_VIDEO_YOUTUBE_DEFAULT_QUERY
     resolutions = [
@@ -319,21 +996,39 @@ class YoutubeBackend(VideoBackend):
     :type: bool
     """
 
-    def get_code(self):
-        code = super().get_code()
-
-        if not code:
-            parsed_url = urlparse.urlparse(self._url)
-            parsed_qs = urlparse.parse_qs(parsed_url.query)
-
-            if "v" in parsed_qs:
-                code = parsed_qs["v"][0]
-            elif "video_id" in parsed_qs:
-                code = parsed_qs["video_id"][0]
-            else:
-                raise UnknownIdException("Cannot get ID from `{0}`".format(self._url))
-
-        return code
+    @classmethod
+    def parse_code(cls, url):
+        hostname, segments, query, fragment = split_url(url)
+
+        if not segments and fragment.startswith("/"):
+            # Mobile URLs, eg. m.youtube.com/#/watch?v=...
+            _, segments, query, fragment = split_url("youtube.com" + fragment)
+
+        lower_segments = [segment.lower() for segment in segments[:3]]
+        if hostname == "youtu.be":
+            candidates = segments[:1]
+        elif lower_segments[:1] in ([prefix] for prefix in cls.code_prefixes):
+            candidates = segments[1:2]
+        elif lower_segments == ["feeds", "api", "videos"]:
+            candidates = segments[3:4]
+        elif lower_segments[:1] == ["user"]:
+            # Old channel URLs, eg. youtube.com/user/name#p/u/1/...
+            candidates = fragment.split("/")[-1:]
+        elif lower_segments[:1] in (["watch"], ["ytscreeningroom"]):
+            candidates = query.get("v", [])[:1]
+        else:
+            candidates = segments[:1]
+
+        for candidate in candidates:
+            match = cls.re_code.match(candidate)
+            if match:
+                return match.group()
+
+        if "v" in query:
+            return query["v"][0]
+        if "video_id" in query:
+            return query["video_id"][0]
+        raise UnknownIdException("Cannot get ID from `{0}`".format(url))
 
     def get_thumbnail_url(self):
         """
@@ -343,17 +1038,86 @@ class YoutubeBackend(VideoBackend):
         :rtype: str
         """
         if not EMBED_VIDEO_YOUTUBE_CHECK_THUMBNAIL:
-            return self.pattern_thumbnail_url.format(
-                code=self.code, protocol=self.protocol, resolution="hqdefault.jpg"
-            )
+            resolution = "hqdefault.jpg"
+        else:
+            resolution = self.get_cached("thumbnail", self.get_thumbnail_resolution)
+            if resolution is None:
+                return None
+        return self.pattern_thumbnail_url.format(
+            code=self.code, protocol=self.protocol, resolution=resolution
+        )
+
+    def get_lite_thumbnail_url(self):
+        """
+        Returns thumbnail URL without checking available resolutions, so lite
+        code isn't slower than the player. The best resolution is used if it
+        is cached already, otherwise ``hqdefault.jpg``.
+
+        :rtype: str | None
+        """
+        resolution = self.peek_cached("thumbnail", "hqdefault.jpg")
+        if resolution is None:
+            return None
+        return self.pattern_thumbnail_url.format(
+            code=self.code, protocol=self.protocol, resolution=resolution
+        )
+
+    def get_thumbnail_resolution(self):
+        """
+        Returns the best of :py:data:`resolutions` available for the video or
+        ``None`` if there is no thumbnail.
+
+        If :setting:`EMBED_VIDEO_YOUTUBE_CHECK_THUMBNAIL_CONCURRENTLY` is set,
+        all resolutions are checked at once in the shared thread pool.
+
+        :rtype: str | None
+        """
+        if EMBED_VIDEO_YOUTUBE_CHECK_THUMBNAIL_CONCURRENTLY and not utils.in_worker():
+            return self._get_thumbnail_resolution_concurrently()
+
         for resolution in self.resolutions:
-            temp_thumbnail_url = self.pattern_thumbnail_url.format(
-                code=self.code, protocol=self.protocol, resolution=resolution
-            )
-            if int(requests.head(temp_thumbnail_url).status_code) < 400:
-                return temp_thumbnail_url
+            if self.thumbnail_exists(resolution):
+                return resolution
         return None
 
+    def _get_thumbnail_resolution_concurrently(self):
+        futures = [
+            utils.submit(self.thumbnail_exists, resolution)
+            for resolution in self.resolutions
+        ]
+        try:
+            # The best resolution is known as soon as all better ones failed.
+            for resolution, future in zip(self.resolutions, futures):
+                if future.result():
+                    return resolution
+            return None
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def thumbnail_exists(self, resolution):
+        """
+        Checks by ``HEAD`` request if thumbnail in given resolution exists.
+
+        :type resolution: str
+        :rtype: bool
+        """
+        thumbnail_url = self.pattern_thumbnail_url.format(
+            code=self.code, protocol=self.protocol, resolution=resolution
+        )
+        response = http.head(thumbnail_url, timeout=EMBED_VIDEO_TIMEOUT)
+        return int(response.status_code) < 400
+
+    def exists(self):
+        # Thumbnail in default resolution is available for all videos.
+        thumbnail_url = self.pattern_thumbnail_url.format(
+            code=self.code, protocol=self.protocol, resolution="hqdefault.jpg"
+        )
+        return response_exists(http.head(thumbnail_url, timeout=EMBED_VIDEO_TIMEOUT))
+
+    def get_cache_key(self):
+        return self.code
+
 
 class VimeoBackend(VideoBackend):
     """
@@ -361,11 +1125,14 @@ class VimeoBackend(VideoBackend):
     """
 
     re_detect = re.compile(r"^((http(s)?:)?//)?(www\.)?(player\.)?vimeo\.com/.*", re.I)
-    re_code = re.compile(
-        r"""vimeo\.com/(video/)?(channels/(.*/)?)?((.+)/review/)?(manage/)?(?P<code>[0-9]+)""",
-        re.I,
-    )
+    hostnames = ("vimeo.com", "player.vimeo.com")
+    re_code = re.compile(r"[0-9]+")
+    """
+    Compiled regex matching path segment which is video code. Code is found
+    by :py:meth:`parse_code` in structure of URL.
+    """
     pattern_url = "{protocol}://player.vimeo.com/video/{code}"
+    preconnect_origins = ("https://player.vimeo.com", "https://i.vimeocdn.com")
     pattern_info = "{protocol}://vimeo.com/api/v2/video/{code}.json"
 
     is_secure = True
@@ -375,16 +1142,45 @@ class VimeoBackend(VideoBackend):
     :type: bool
     """
 
+    @classmethod
+    def parse_code(cls, url):
+        _, segments, _, _ = split_url(url)
+        lower_segments = [segment.lower() for segment in segments]
+
+        # Code follows these segments, eg. vimeo.com/user/review/{code}/hash
+        for keyword in ("review", "video"):
+            if keyword in lower_segments:
+                segments = segments[lower_segments.index(keyword) + 1 :][:1]
+                break
+
+        # Whole segment is the code, names of channels can start with digits.
+        for segment in segments:
+            match = cls.re_code.fullmatch(segment)
+            if match:
+                return match.group()
+
+    def get_cache_key(self):
+        return self.code
+
     def get_info(self):
+        response = http.get(
+            self.pattern_info.format(code=self.code, protocol=self.protocol),
+            timeout=EMBED_VIDEO_TIMEOUT,
+        )
+        if not response_exists(response):
+            raise VideoDoesntExistException()
         try:
-            response = requests.get(
-                self.pattern_info.format(code=self.code, protocol=self.protocol),
-                timeout=EMBED_VIDEO_TIMEOUT,
-            )
             return json.loads(response.text)[0]
         except ValueError:
             raise VideoDoesntExistException()
 
+    def exists(self):
+        response = http.get(
+            self.pattern_info.format(code=self.code, protocol=self.protocol),
+            timeout=EMBED_VIDEO_TIMEOUT,
+        )
+        return response_exists(response)
+
     def get_thumbnail_url(self):
         return self.info.get("thumbnail_large")
 
@@ -397,8 +1193,11 @@ class SoundCloudBackend(VideoBackend):
     base_url = "{protocol}://soundcloud.com/oembed"
 
     re_detect = re.compile(r"^(http(s)?://(www\.|m\.)?)?soundcloud\.com/.*", re.I)
+    hostnames = ("soundcloud.com",)
     re_code = re.compile(r'src=".*%2F(?P<code>\d+)&show_artwork.*"', re.I)
     re_url = re.compile(r'src="(?P<url>.*?)"', re.I)
+    preconnect_origins = ("https://w.soundcloud.com", "https://i1.sndcdn.com")
+    autoplay_query = None
 
     is_secure = True
     """
@@ -423,13 +1222,13 @@ class SoundCloudBackend(VideoBackend):
 
     def get_info(self):
         params = {"format": "json", "url": self._url}
-        r = requests.get(
+        r = http.get(
             self.base_url.format(protocol=self.protocol),
             params=params,
             timeout=EMBED_VIDEO_TIMEOUT,
         )
 
-        if r.status_code != 200:
+        if not response_exists(r):
             raise VideoDoesntExistException(
                 "SoundCloud returned status code `{status_code}` for URL `{url}`.".format(
                     status_code=r.status_code,
@@ -439,16 +1238,43 @@ class SoundCloudBackend(VideoBackend):
 
         return json.loads(r.text)
 
+    def exists(self):
+        params = {"format": "json", "url": self._url}
+        response = http.get(
+            self.base_url.format(protocol=self.protocol),
+            params=params,
+            timeout=EMBED_VIDEO_TIMEOUT,
+        )
+        return response_exists(response)
+
     def get_thumbnail_url(self):
         return self.info.get("thumbnail_url")
 
-    def get_url(self):
+    @cached_property
+    def player_url(self):
+        """
+        URL of player parsed from embed code returned by SoundCloud.
+
+        :rtype: str
+        """
         match = self.re_url.search(self.info.get("html"))
         return match.group("url")
 
-    def get_code(self):
+    @cached_property
+    def player_code(self):
+        """
+        Code of track parsed from embed code returned by SoundCloud.
+
+        :rtype: str
+        """
         match = self.re_code.search(self.info.get("html"))
         return match.group("code")
 
+    def get_url(self):
+        return self.player_url
+
+    def get_code(self):
+        return self.player_code
+
     def get_embed_code(self, width, height):
         return super().get_embed_code(width=width, height=height)
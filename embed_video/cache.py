@@ -0,0 +1,194 @@
+import hashlib
+import logging
+import time
+
+from django.core.cache import caches
+
+from embed_video import http, utils
+from embed_video.settings import (
+    EMBED_VIDEO_CACHE,
+    EMBED_VIDEO_CACHE_NEGATIVE_TIMEOUT,
+    EMBED_VIDEO_CACHE_STALE_TIMEOUT,
+    EMBED_VIDEO_CACHE_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "embed_video"
+
+REFRESH_LOCK_TIMEOUT = 60
+"""
+Number of seconds other processes don't refresh the same stale value.
+"""
+
+_missing = object()
+
+
+class NegativeEntry:
+    """
+    Cached replacement of value which couldn't be fetched. Holds the exception
+    which is raised again on each cache hit.
+    """
+
+    def __init__(self, exception):
+        self.exception = exception
+
+
+class FreshEntry:
+    """
+    Cached value which is fresh until ``fresh_until`` (timestamp). Later it
+    is stale, but it is still returned while it is refreshed in background.
+    """
+
+    def __init__(self, value, fresh_until):
+        self.value = value
+        self.fresh_until = fresh_until
+
+
+def get_cache():
+    """
+    Returns cache set by :setting:`EMBED_VIDEO_CACHE` or ``None`` if caching
+    is disabled.
+
+    :rtype: django.core.cache.backends.base.BaseCache | None
+    """
+    if EMBED_VIDEO_CACHE is None:
+        return None
+    return caches[EMBED_VIDEO_CACHE]
+
+
+def make_key(kind, backend_name, identifier):
+    """
+    Returns cache key safe for all cache backends (including memcached).
+
+    :param kind: Type of cached data (eg. ``info``).
+    :type kind: str
+    :param backend_name: Name of backend class.
+    :type backend_name: str
+    :param identifier: Identifier of video, eg. its code or URL.
+    :type identifier: str
+    :rtype: str
+    """
+    digest = hashlib.md5(str(identifier).encode("utf-8")).hexdigest()
+    return "{prefix}:{kind}:{backend}:{digest}".format(
+        prefix=KEY_PREFIX, kind=kind, backend=backend_name, digest=digest
+    )
+
+
+def peek(key, default=None):
+    """
+    Returns value stored under ``key`` without fetching it, or ``default`` if
+    it isn't cached, caching is disabled or the cached fetch failed.
+
+    :type key: str
+    """
+    cache = get_cache()
+    if cache is None:
+        return default
+    value = cache.get(key, _missing)
+    if isinstance(value, FreshEntry):
+        return value.value
+    if value is _missing or isinstance(value, NegativeEntry):
+        return default
+    return value
+
+
+def get_or_fetch(
+    key,
+    fetch,
+    timeout=None,
+    negative_timeout=None,
+    negative_exceptions=(),
+    stale_timeout=None,
+):
+    """
+    Returns value stored under ``key``. If it is not cached yet, ``fetch`` is
+    called and its result is saved for ``timeout`` seconds.
+
+    If ``stale_timeout`` (default :setting:`EMBED_VIDEO_CACHE_STALE_TIMEOUT`)
+    is set, the value is kept ``stale_timeout`` seconds longer. Stale value is
+    returned at once and ``fetch`` is called in background by
+    :py:func:`~embed_video.utils.submit` to refresh it. Only a true miss
+    waits for ``fetch``.
+
+    If ``fetch`` raises one of ``negative_exceptions``, the exception is
+    cached for ``negative_timeout`` seconds and raised again on following
+    calls without calling ``fetch``.
+
+    :type key: str
+    :type fetch: callable
+    :type timeout: int | None
+    :type negative_timeout: int | None
+    :type negative_exceptions: tuple[type[Exception]]
+    :type stale_timeout: int | None
+    """
+    cache = get_cache()
+    if cache is None:
+        return fetch()
+
+    value = cache.get(key, _missing)
+    if isinstance(value, NegativeEntry):
+        raise value.exception
+    if isinstance(value, FreshEntry):
+        if value.fresh_until <= time.time() and cache.add(
+            key + ":refresh", True, REFRESH_LOCK_TIMEOUT
+        ):
+            utils.submit(
+                _refresh,
+                key,
+                fetch,
+                timeout,
+                negative_timeout,
+                negative_exceptions,
+                stale_timeout,
+            )
+        return value.value
+    if value is not _missing:
+        return value
+
+    return _fetch(
+        cache, key, fetch, timeout, negative_timeout, negative_exceptions, stale_timeout
+    )
+
+
+def _fetch(
+    cache, key, fetch, timeout, negative_timeout, negative_exceptions, stale_timeout
+):
+    try:
+        value = fetch()
+    except negative_exceptions as e:
+        cache.set(
+            key,
+            NegativeEntry(e),
+            (
+                EMBED_VIDEO_CACHE_NEGATIVE_TIMEOUT
+                if negative_timeout is None
+                else negative_timeout
+            ),
+        )
+        raise
+
+    timeout = EMBED_VIDEO_CACHE_TIMEOUT if timeout is None else timeout
+    stale_timeout = (
+        EMBED_VIDEO_CACHE_STALE_TIMEOUT if stale_timeout is None else stale_timeout
+    )
+    if stale_timeout:
+        cache.set(
+            key, FreshEntry(value, time.time() + timeout), timeout + stale_timeout
+        )
+    else:
+        cache.set(key, value, timeout)
+    return value
+
+
+def _refresh(key, fetch, *args):
+    cache = get_cache()
+    try:
+        # Nobody waits for the refresh, budget of the request doesn't apply.
+        with http.budget(None):
+            _fetch(cache, key, fetch, *args)
+    except Exception:
+        # Stale value is kept until it expires or the next refresh succeeds.
+        logger.warning("Refresh of cached `%s` failed", key, exc_info=True)
+    finally:
+        cache.delete(key + ":refresh")
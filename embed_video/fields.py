@@ -1,35 +1,409 @@
+import copy
+import logging
+from concurrent.futures import TimeoutError
+
+import requests
 from django import forms
+from django.apps import apps
+from django.core import checks
+from django.core.exceptions import FieldDoesNotExist, FieldError
 from django.db import models
+from django.db.models import signals
+from django.db.models.expressions import Col
 from django.utils.translation import gettext_lazy as _
 
+from embed_video import http, utils
 from embed_video.backends import (
+    EmbedVideoException,
+    ProviderUnavailableException,
     UnknownBackendException,
     UnknownIdException,
     VideoDoesntExistException,
     detect_backend,
 )
+from embed_video.settings import EMBED_VIDEO_VALIDATION, EMBED_VIDEO_VALIDATION_TIMEOUT
+
+__all__ = (
+    "EmbedVideoField",
+    "EmbedVideoFormField",
+    "backfill_video_fields",
+    "get_video_fields",
+    "prefetch_videos",
+)
+
+logger = logging.getLogger(__name__)
+
+
+class VideoBackendDescriptor:
+    """
+    Provides ``<field_name>_backend`` attribute of models with
+    :py:class:`EmbedVideoField`. Backend is detected on first access and
+    stored in the instance together with the URL it was detected from, so
+    it is detected again only after the URL changes. It is ``None`` if URL
+    is empty or not recognized.
+    """
+
+    def __init__(self, field):
+        self.field = field
 
-__all__ = ("EmbedVideoField", "EmbedVideoFormField")
+    @property
+    def cache_name(self):
+        return "_{0}_cache".format(self.field.backend_attname)
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        url = getattr(instance, self.field.attname)
+        cached = instance.__dict__.get(self.cache_name)
+        if cached is not None and cached[0] == url:
+            return cached[1]
+        try:
+            backend = detect_backend(str(url)) if url else None
+        except UnknownBackendException:
+            backend = None
+        instance.__dict__[self.cache_name] = (url, backend)
+        return backend
+
+    def __set__(self, instance, backend):
+        url = getattr(instance, self.field.attname)
+        instance.__dict__[self.cache_name] = (url, backend)
 
 
 class EmbedVideoField(models.URLField):
     """
     Model field for embedded video. Descendant of
     :py:class:`django.db.models.URLField`.
+
+    Detected backend of the video is available as ``<field_name>_backend``
+    attribute of model instance (eg. ``item.video_backend``), see
+    :py:class:`VideoBackendDescriptor`.
+
+    Provider name, code and embed URL of video can be kept in companion
+    fields of the model, which are filled in when the model is saved:
+
+    ::
+
+        class Item(models.Model):
+            video = EmbedVideoField(
+                provider_field="video_provider", code_field="video_code"
+            )
+            video_provider = models.CharField(max_length=50, db_index=True)
+            video_code = models.CharField(max_length=100, db_index=True)
+
+    Companion fields are queried by ``provider``, ``code`` and ``url``
+    lookups, eg. ``Item.objects.filter(video__provider="youtube")``. Fill
+    them in for existing rows by :py:func:`backfill_video_fields`.
+
+    Result and time of the last check if video still exists are written to
+    ``status_field`` and ``checked_field`` by ``embed_video_scan`` management
+    command.
     """
 
+    def __init__(
+        self,
+        verbose_name=None,
+        name=None,
+        provider_field=None,
+        code_field=None,
+        url_field=None,
+        status_field=None,
+        checked_field=None,
+        **kwargs
+    ):
+        """
+        :param provider_field: Name of field for
+            :py:meth:`~embed_video.backends.VideoBackend.get_provider_name`
+        :type provider_field: str | None
+        :param code_field: Name of field for video code
+        :type code_field: str | None
+        :param url_field: Name of field for embed URL of video
+        :type url_field: str | None
+        :param status_field: Name of field for result of existence check
+        :type status_field: str | None
+        :param checked_field: Name of
+            :py:class:`~django.db.models.DateTimeField` for time of
+            existence check
+        :type checked_field: str | None
+        """
+        self.provider_field = provider_field
+        self.code_field = code_field
+        self.url_field = url_field
+        self.status_field = status_field
+        self.checked_field = checked_field
+        super().__init__(verbose_name, name, **kwargs)
+
+    @property
+    def backend_attname(self):
+        """
+        Name of model attribute with backend of the video.
+
+        :rtype: str
+        """
+        return "{0}_backend".format(self.attname)
+
+    @property
+    def video_fields(self):
+        """
+        Names of companion fields by kind of stored value (``provider``,
+        ``code`` or ``url``).
+
+        :rtype: dict
+        """
+        fields = {
+            "provider": self.provider_field,
+            "code": self.code_field,
+            "url": self.url_field,
+        }
+        return {kind: name for kind, name in fields.items() if name}
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        for option in (
+            "provider_field",
+            "code_field",
+            "url_field",
+            "status_field",
+            "checked_field",
+        ):
+            if getattr(self, option):
+                kwargs[option] = getattr(self, option)
+        return name, path, args, kwargs
+
+    @property
+    def saved_url_attname(self):
+        """
+        Name of instance attribute with URL companion fields were determined
+        for.
+
+        :rtype: str
+        """
+        return "_{0}_saved_url".format(self.attname)
+
+    def check(self, **kwargs):
+        return [*super().check(**kwargs), *self._check_video_fields()]
+
+    def _check_video_fields(self):
+        errors = []
+        for name in self.video_fields.values():
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                errors.append(
+                    checks.Error(
+                        "Companion field '{0}' of '{1}' doesn't exist.".format(
+                            name, self.name
+                        ),
+                        obj=self,
+                        id="embed_video.E001",
+                    )
+                )
+                continue
+            # Values of fields are read for saving in order of declaration.
+            if field.creation_counter < self.creation_counter:
+                errors.append(
+                    checks.Error(
+                        "Companion field '{0}' has to be declared after "
+                        "'{1}'.".format(name, self.name),
+                        obj=self,
+                        id="embed_video.E002",
+                    )
+                )
+        return errors
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+        if not hasattr(cls, self.backend_attname):
+            setattr(cls, self.backend_attname, VideoBackendDescriptor(self))
+        # URL loaded from database isn't detected again on save if unchanged.
+        if self.video_fields and not cls._meta.abstract:
+            signals.class_prepared.connect(self.connect_remember_saved_url)
+
+    def connect_remember_saved_url(self, sender, **kwargs):
+        # Proxy and multi-table child models send post_init as own senders.
+        if issubclass(sender, self.model):
+            signals.post_init.connect(self.remember_saved_url, sender=sender)
+            signals.post_save.connect(self.remember_written_url, sender=sender)
+
+    def remember_saved_url(self, instance, **kwargs):
+        url = instance.__dict__.get(self.attname)
+        if url:
+            instance.__dict__[self.saved_url_attname] = url
+
+    def remember_written_url(self, instance, update_fields=None, **kwargs):
+        url = instance.__dict__.get(self.attname)
+        if update_fields is not None:
+            if not {self.name, self.attname} & set(update_fields):
+                return
+            missing = [
+                name for name in self.video_fields.values() if name not in update_fields
+            ]
+            if missing and instance.__dict__.get(self.saved_url_attname) != url:
+                # Companion fields filled in by pre_save() but left out by
+                # update_fields are written too, so they match the URL.
+                instance._meta.base_manager.filter(pk=instance.pk).update(
+                    **{name: getattr(instance, name) for name in missing}
+                )
+        instance.__dict__[self.saved_url_attname] = url
+
+    def pre_save(self, model_instance, add):
+        """
+        Fills in companion fields, unless URL is the same as when the model
+        was loaded or saved and the companion fields are set.
+        """
+        url = super().pre_save(model_instance, add)
+        if self.video_fields and (
+            add
+            or model_instance.__dict__.get(self.saved_url_attname) != url
+            or not self.has_video_values(model_instance)
+        ):
+            self.update_video_fields(model_instance)
+            # URL is remembered after companion fields are written.
+            model_instance.__dict__.pop(self.saved_url_attname, None)
+        return url
+
+    def get_video_values(self, url):
+        """
+        Returns values of companion fields for given URL. Values which can't
+        be determined (eg. for unknown URL or when remote server is
+        unavailable) are ``None``.
+
+        :type url: str
+        :rtype: dict
+        """
+        values = dict.fromkeys(self.video_fields)
+        if not url:
+            return values
+
+        try:
+            backend = detect_backend(str(url))
+        except UnknownBackendException:
+            return values
+
+        if "provider" in values:
+            values["provider"] = backend.get_provider_name()
+        try:
+            if "code" in values:
+                values["code"] = backend.code
+            if "url" in values:
+                values["url"] = backend.url
+        except (EmbedVideoException, requests.RequestException):
+            logger.debug("Code of `{0}` wasn't determined".format(url), exc_info=True)
+        return values
+
+    def has_video_values(self, instance):
+        """
+        Returns ``True`` if all companion fields of ``instance`` are set.
+
+        :type instance: django.db.models.Model
+        :rtype: bool
+        """
+        return all(
+            getattr(instance, instance._meta.get_field(name).attname) not in ("", None)
+            for name in self.video_fields.values()
+        )
+
+    def update_video_fields(self, instance):
+        """
+        Fills in companion fields of ``instance``. Called before the model is
+        saved.
+
+        :type instance: django.db.models.Model
+        """
+        url = getattr(instance, self.attname)
+        values = self.get_video_values(url)
+        for kind, name in self.video_fields.items():
+            field = instance._meta.get_field(name)
+            value = values[kind]
+            setattr(
+                instance,
+                field.attname,
+                "" if value is None and not field.null else value,
+            )
+
     def formfield(self, **kwargs):
         defaults = {"form_class": EmbedVideoFormField}
         defaults.update(kwargs)
         return super().formfield(**defaults)
 
 
+class VideoFieldTransform(models.Transform):
+    """
+    Transform replacing :py:class:`EmbedVideoField` with its companion field
+    of kind :py:data:`kind`, so the query can use index of the column.
+    """
+
+    kind = None
+
+    def get_video_field(self):
+        field = self.lhs.output_field
+        name = field.video_fields.get(self.kind)
+        if name is None or not isinstance(self.lhs, Col):
+            raise FieldError(
+                "Field `{0}` doesn't support `{1}` lookup, set `{1}_field` "
+                "option.".format(field.name, self.kind)
+            )
+        return field.model._meta.get_field(name)
+
+    @property
+    def output_field(self):
+        return self.get_video_field()
+
+    def as_sql(self, compiler, connection):
+        return compiler.compile(Col(self.lhs.alias, self.get_video_field()))
+
+
+@EmbedVideoField.register_lookup
+class ProviderTransform(VideoFieldTransform):
+    lookup_name = kind = "provider"
+
+
+@EmbedVideoField.register_lookup
+class CodeTransform(VideoFieldTransform):
+    lookup_name = kind = "code"
+
+
+@EmbedVideoField.register_lookup
+class UrlTransform(VideoFieldTransform):
+    lookup_name = kind = "url"
+
+
+def _check_remote(backend):
+    backend.get_code()
+    try:
+        return backend.exists()
+    except NotImplementedError:
+        # Backend can't check it, valid code is enough.
+        return True
+
+
 class EmbedVideoFormField(forms.URLField):
     """
     Form field for embeded video. Descendant of
     :py:class:`django.forms.URLField`
+
+    URLs are validated according to :setting:`EMBED_VIDEO_VALIDATION`, which
+    can be overridden by ``validation`` argument, eg. for bulk imports::
+
+        video = EmbedVideoFormField(validation="syntax")
     """
 
+    validation_policies = ("syntax", "cached", "strict")
+
+    def __init__(self, *args, validation=None, **kwargs):
+        """
+        :param validation: ``"syntax"``, ``"cached"`` or ``"strict"``, see
+            :setting:`EMBED_VIDEO_VALIDATION`
+        :type validation: str | None
+        """
+        self.validation = validation or EMBED_VIDEO_VALIDATION
+        if self.validation not in self.validation_policies:
+            raise ValueError(
+                "Unknown validation `{0}`, use one of {1}.".format(
+                    self.validation, ", ".join(self.validation_policies)
+                )
+            )
+        super().__init__(*args, **kwargs)
+
     def validate(self, url):
         # if empty url is not allowed throws an exception
         super().validate(url)
@@ -39,7 +413,17 @@ class EmbedVideoFormField(forms.URLField):
 
         try:
             backend = detect_backend(url)
-            backend.get_code()
+            if self.validation == "strict":
+                # Requests made by strict validation mustn't hold the form
+                # for long.
+                with http.budget(EMBED_VIDEO_VALIDATION_TIMEOUT):
+                    self.validate_remote(backend)
+            elif self.validation == "cached" or backend.has_local_code():
+                backend.get_code()
+            # Widgets (eg. AdminVideoWidget) can reuse detected backend.
+            backends = getattr(self.widget, "backends", None)
+            if backends is not None:
+                backends[url] = backend
         except UnknownBackendException:
             raise forms.ValidationError(_("URL could not be recognized."))
         except UnknownIdException:
@@ -48,4 +432,166 @@ class EmbedVideoFormField(forms.URLField):
             )
         except VideoDoesntExistException:
             raise forms.ValidationError(_("This media not found on site."))
+        except (ProviderUnavailableException, requests.RequestException):
+            raise forms.ValidationError(
+                _("Video couldn't be verified, try again later.")
+            )
         return url
+
+    def validate_remote(self, backend):
+        """
+        Checks on remote server that video exists, waiting for at most
+        :setting:`EMBED_VIDEO_VALIDATION_TIMEOUT` seconds.
+
+        :type backend: embed_video.backends.VideoBackend
+        """
+        try:
+            if utils.in_worker():
+                exists = _check_remote(backend)
+            else:
+                exists = utils.submit(_check_remote, backend).result(
+                    timeout=EMBED_VIDEO_VALIDATION_TIMEOUT
+                )
+        except (TimeoutError, requests.RequestException):
+            raise forms.ValidationError(
+                _("Video couldn't be verified, try again later.")
+            )
+        if not exists:
+            raise VideoDoesntExistException
+
+
+def get_video_fields(models=None):
+    """
+    Returns ``(model, field)`` pairs of all :py:class:`EmbedVideoField`
+    fields of installed concrete models, or of given ``models`` only.
+
+    :type models: list[type[django.db.models.Model]] | None
+    :rtype: list[tuple]
+    """
+    if models is None:
+        models = apps.get_models()
+    return [
+        (model, field)
+        for model in models
+        if not model._meta.proxy
+        for field in model._meta.concrete_fields
+        if isinstance(field, EmbedVideoField) and field.model is model
+    ]
+
+
+def backfill_video_fields(queryset, field_name, batch_size=1000):
+    """
+    Fills in companion fields of :py:class:`EmbedVideoField` ``field_name``
+    for all objects of ``queryset``. Objects are loaded and updated in chunks
+    of ``batch_size`` ordered by primary key, so it can be used in data
+    migrations of large tables:
+
+    ::
+
+        def backfill(apps, schema_editor):
+            Item = apps.get_model("items", "Item")
+            backfill_video_fields(Item.objects.all(), "video")
+
+    Companion fields are set by options of the field passed in
+    ``queryset.model``, so historical models in migrations need the options
+    set in migration which added companion fields.
+
+    :type queryset: django.db.models.QuerySet
+    :type field_name: str
+    :type batch_size: int
+    :return: Number of updated objects.
+    :rtype: int
+    """
+    field = queryset.model._meta.get_field(field_name)
+    names = list(field.video_fields.values())
+    if not names:
+        raise FieldError("Field `{0}` has no companion fields.".format(field_name))
+
+    queryset = queryset.order_by("pk").only("pk", field.attname)
+    count = 0
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        objects = list(chunk[:batch_size])
+        if not objects:
+            return count
+        for obj in objects:
+            field.update_video_fields(obj)
+        queryset.model._default_manager.bulk_update(objects, names)
+        count += len(objects)
+        last_pk = objects[-1].pk
+
+
+def _prefetch_backend(backend, thumbnails):
+    try:
+        try:
+            backend.info
+        except NotImplementedError:
+            pass
+        if thumbnails:
+            backend.thumbnail
+    except (EmbedVideoException, requests.RequestException):
+        # Rendering will fail and log the problem.
+        logger.debug("Prefetching of `{0}` failed".format(backend._url), exc_info=True)
+
+
+def prefetch_videos(objects, field_name, thumbnails=False):
+    """
+    Detects backends of ``field_name`` URLs of all ``objects`` and fetches
+    their :py:data:`~embed_video.backends.VideoBackend.info` (and thumbnails
+    if ``thumbnails`` is set) in parallel, so rendering doesn't wait for
+    remote servers one by one.
+
+    Backend of each object is set to ``<field_name>_backend`` attribute, or
+    ``None`` if URL is empty or not recognized.
+
+    Usage::
+
+        posts = prefetch_videos(page.object_list, "video", thumbnails=True)
+
+    .. code-block:: html+django
+
+        {% for post in posts %}
+            {% video post.video_backend "small" %}
+        {% endfor %}
+
+    :type objects: django.db.models.QuerySet | list
+    :type field_name: str
+    :type thumbnails: bool
+    :return: List of given objects.
+    :rtype: list
+    """
+    objects = list(objects)
+    attname = "{0}_backend".format(field_name)
+
+    backends = {}
+    for obj in objects:
+        url = getattr(obj, field_name)
+        if url and url not in backends:
+            try:
+                backends[url] = detect_backend(str(url))
+            except UnknownBackendException:
+                backends[url] = None
+
+    to_fetch = [backend for backend in backends.values() if backend is not None]
+    if utils.in_worker():
+        for backend in to_fetch:
+            _prefetch_backend(backend, thumbnails)
+    else:
+        futures = [
+            utils.submit(_prefetch_backend, backend, thumbnails) for backend in to_fetch
+        ]
+        for future in futures:
+            future.result()
+
+    used = set()
+    for obj in objects:
+        url = getattr(obj, field_name)
+        backend = backends.get(url) if url else None
+        if backend is not None:
+            # Objects with the same URL share fetched data, not options.
+            backend = copy.copy(backend) if url in used else backend
+            used.add(url)
+        setattr(obj, attname, backend)
+
+    return objects
@@ -0,0 +1,125 @@
+import contextvars
+import re
+
+from django.utils.html import format_html, format_html_join
+
+from embed_video.backends import VideoBackend, detect_backend_class
+from embed_video.settings import EMBED_VIDEO_HINTS_HEADER
+
+_origins = contextvars.ContextVar("embed_video_origins", default=None)
+
+re_head_end = re.compile(rb"</head\s*>", re.I)
+
+
+def record_video(video):
+    """
+    Records origins of video rendered during current request. Does nothing
+    outside :py:class:`ResourceHintsMiddleware`.
+
+    :type video: str | embed_video.backends.VideoBackend
+    """
+    origins = _origins.get()
+    if origins is None:
+        return
+    backend_class = (
+        type(video)
+        if isinstance(video, VideoBackend)
+        else detect_backend_class(str(video))
+    )
+    for origin in backend_class.get_preconnect_origins():
+        origins[origin] = None
+
+
+def get_recorded_origins():
+    """
+    Returns origins recorded during current request, in order of first use.
+
+    :rtype: list[str]
+    """
+    return list(_origins.get() or ())
+
+
+def render_hints(origins):
+    """
+    Returns ``preconnect`` and ``dns-prefetch`` links of origins.
+
+    :type origins: list[str]
+    :rtype: django.utils.safestring.SafeText
+    """
+    return format_html_join(
+        "",
+        '<link rel="preconnect" href="{0}"><link rel="dns-prefetch" href="{0}">',
+        ((origin,) for origin in origins),
+    )
+
+
+def format_link_header(origins):
+    """
+    Returns value of ``Link`` header with ``preconnect`` of origins.
+
+    :type origins: list[str]
+    :rtype: str
+    """
+    return ", ".join("<{0}>; rel=preconnect".format(origin) for origin in origins)
+
+
+class ResourceHintsMiddleware:
+    """
+    Adds ``preconnect`` and ``dns-prefetch`` hints for origins of videos
+    rendered by ``{% video %}`` tag to ``<head>`` of HTML responses, so the
+    browser connects to video providers before it finds their players.
+
+    If :setting:`EMBED_VIDEO_HINTS_HEADER` is set, the hints are sent in
+    ``Link`` header, too. Django can't send ``103 Early Hints`` responses, but
+    some proxies and CDNs send them from ``Link`` headers of former responses.
+
+    .. code-block:: python
+
+        MIDDLEWARE = [
+            ...
+            "embed_video.hints.ResourceHintsMiddleware",
+        ]
+
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _origins.set({})
+        try:
+            response = self.get_response(request)
+            origins = get_recorded_origins()
+        finally:
+            _origins.reset(token)
+
+        if origins:
+            self.add_hints(response, origins)
+        return response
+
+    def add_hints(self, response, origins):
+        """
+        :type response: django.http.HttpResponse
+        :type origins: list[str]
+        """
+        if EMBED_VIDEO_HINTS_HEADER:
+            link = format_link_header(origins)
+            if response.has_header("Link"):
+                link = response["Link"] + ", " + link
+            response["Link"] = link
+
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or not response.get("Content-Type", "").startswith("text/html")
+        ):
+            return
+
+        hints = render_hints(origins).encode(response.charset)
+        content, count = re_head_end.subn(
+            lambda match: hints + match.group(), response.content, count=1
+        )
+        if count:
+            response.content = content
+            if response.has_header("Content-Length"):
+                response["Content-Length"] = str(len(content))
@@ -0,0 +1,202 @@
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from embed_video.settings import (
+    EMBED_VIDEO_HTTP_POOL_SIZE,
+    EMBED_VIDEO_REQUEST_BUDGET,
+    EMBED_VIDEO_TIMEOUT,
+    EMBED_VIDEO_USER_AGENT,
+)
+
+_session = None
+_session_lock = threading.Lock()
+
+_deadline = contextvars.ContextVar("embed_video_deadline", default=None)
+
+
+class BudgetExceededException(requests.Timeout):
+    """
+    Exception thrown instead of request to remote server when time set by
+    :py:func:`budget` is spent.
+    """
+
+    pass
+
+
+def _reset_session():
+    global _session, _session_lock
+    # Connections of the parent process mustn't be shared with the child.
+    _session = None
+    _session_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_session)
+
+
+def create_session():
+    """
+    Returns new :py:class:`requests.Session` configured by
+    :setting:`EMBED_VIDEO_HTTP_POOL_SIZE` and
+    :setting:`EMBED_VIDEO_USER_AGENT`. Cookies are never stored, so the
+    session can be shared by threads.
+
+    :rtype: requests.Session
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    session.headers["User-Agent"] = EMBED_VIDEO_USER_AGENT
+
+    adapter = HTTPAdapter(pool_maxsize=EMBED_VIDEO_HTTP_POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """
+    Returns session shared by all backends. Connections to each host are kept
+    alive in separate pools and reused by following requests.
+
+    :rtype: requests.Session
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def close_session():
+    """
+    Closes connections of the shared session. Next request creates new one.
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+@contextlib.contextmanager
+def budget(seconds):
+    """
+    Limits total time of requests to remote servers made in the block,
+    including threads started by :py:func:`~embed_video.utils.submit`.
+    Timeout of each request is shortened to the remaining time, and when it
+    is spent, :py:exc:`BudgetExceededException` is raised instead of new
+    requests. Nested budget can't exceed the outer one, ``None`` removes the
+    limit.
+
+    .. code-block:: python
+
+        with http.budget(2):
+            html = render_to_string("videos.html", {"videos": videos})
+
+    :type seconds: float | None
+    """
+    deadline = None if seconds is None else time.monotonic() + seconds
+    outer = _deadline.get()
+    if deadline is not None and outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def get_remaining_budget():
+    """
+    Returns number of seconds left of current :py:func:`budget` or ``None``
+    if requests aren't limited.
+
+    :rtype: float | None
+    """
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def _cap_timeout(timeout, remaining):
+    if isinstance(timeout, tuple):
+        return tuple(_cap_timeout(value, remaining) for value in timeout)
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def request(method, url, **kwargs):
+    """
+    Sends request via shared session. Timeout defaults to
+    :setting:`EMBED_VIDEO_TIMEOUT` and it is limited by :py:func:`budget`.
+
+    :type method: str
+    :type url: str
+    :rtype: requests.Response
+    :raises BudgetExceededException: if the budget is spent.
+    """
+    kwargs.setdefault("timeout", EMBED_VIDEO_TIMEOUT)
+    remaining = get_remaining_budget()
+    if remaining is None:
+        return get_session().request(method, url, **kwargs)
+
+    if remaining <= 0:
+        raise BudgetExceededException(
+            "Time budget of requests is spent (`{0}`).".format(url)
+        )
+    timeout = kwargs["timeout"]
+    kwargs["timeout"] = _cap_timeout(timeout, remaining)
+    try:
+        return get_session().request(method, url, **kwargs)
+    except requests.Timeout as e:
+        if kwargs["timeout"] == timeout:
+            raise
+        raise BudgetExceededException(
+            "Time budget of requests is spent (`{0}`).".format(url)
+        ) from e
+
+
+def get(url, **kwargs):
+    """
+    Sends ``GET`` request via shared session.
+
+    :rtype: requests.Response
+    """
+    return request("GET", url, **kwargs)
+
+
+def head(url, **kwargs):
+    """
+    Sends ``HEAD`` request via shared session.
+
+    :rtype: requests.Response
+    """
+    return request("HEAD", url, **kwargs)
+
+
+class RequestBudgetMiddleware:
+    """
+    Limits total time of requests to remote servers made during each request
+    to :setting:`EMBED_VIDEO_REQUEST_BUDGET` seconds (see :py:func:`budget`).
+    Videos rendered after the budget is spent use cached data only.
+
+    .. code-block:: python
+
+        MIDDLEWARE = [
+            ...
+            "embed_video.http.RequestBudgetMiddleware",
+        ]
+
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with budget(EMBED_VIDEO_REQUEST_BUDGET):
+            return self.get_response(request)
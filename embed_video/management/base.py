@@ -0,0 +1,61 @@
+from django.apps import apps
+from django.core.management.base import CommandError
+
+
+def parse_shard(value):
+    """
+    Parses ``i/N`` into ``(i, N)`` tuple, ``i`` is counted from 1.
+
+    :type value: str
+    :rtype: tuple[int, int]
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise CommandError("Shard has to be in format i/N, eg. 1/4.")
+    if not 1 <= index <= count:
+        raise CommandError("Shard i/N has to satisfy 1 <= i <= N.")
+    return index, count
+
+
+def parse_limits(values, type=int):
+    """
+    Parses ``provider=N`` strings into dictionary.
+
+    :type values: list[str]
+    :param type: Type of limits, eg. ``float`` for rates.
+    :type type: type
+    :rtype: dict
+    """
+    limits = {}
+    for value in values:
+        provider, _, limit = value.partition("=")
+        try:
+            limits[provider] = type(limit)
+        except ValueError:
+            raise CommandError("Limit has to be in format provider=N, eg. vimeo=2.")
+        if limits[provider] <= 0:
+            raise CommandError("Limit of `{0}` has to be positive.".format(provider))
+    return limits
+
+
+def get_models(labels):
+    """
+    Returns models of given ``app_label`` or ``app_label.ModelName`` labels,
+    or ``None`` (ie. all models) if no label is given.
+
+    :type labels: list[str]
+    :rtype: list[type[django.db.models.Model]] | None
+    """
+    if not labels:
+        return None
+    models = []
+    for label in labels:
+        try:
+            if "." in label:
+                models.append(apps.get_model(label))
+            else:
+                models.extend(apps.get_app_config(label).get_models())
+        except LookupError as e:
+            raise CommandError(str(e))
+    return models
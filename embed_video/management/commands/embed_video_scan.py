@@ -0,0 +1,275 @@
+import collections
+import csv
+import datetime
+import json
+import os
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+
+from embed_video import utils
+from embed_video.backends import (
+    EmbedVideoException,
+    UnknownBackendException,
+    UnknownIdException,
+    detect_backend,
+)
+from embed_video.fields import get_video_fields
+from embed_video.management.base import get_models, parse_limits
+from embed_video.settings import EMBED_VIDEO_MAX_WORKERS
+
+STATUS_OK = "ok"
+STATUS_MISSING = "missing"
+STATUS_INVALID = "invalid"
+STATUS_UNKNOWN = "unknown"
+STATUS_ERROR = "error"
+"""
+Check failed (eg. remote server didn't respond). It is written only to the
+report, the video is checked again by the next run.
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Checks if videos stored in EmbedVideoField fields still exist. Results "
+        "are written to status_field and checked_field of the fields and to "
+        "CSV report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            metavar="app_label[.ModelName]",
+            help="Check only videos of given applications or models.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rows checked between checkpoints.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=EMBED_VIDEO_MAX_WORKERS,
+            help="Maximum of videos checked at once.",
+        )
+        parser.add_argument(
+            "--provider-limit",
+            action="append",
+            default=[],
+            metavar="PROVIDER=N",
+            help="Maximum of videos of the provider checked at once, eg. vimeo=2.",
+        )
+        parser.add_argument(
+            "--rate",
+            action="append",
+            default=[],
+            metavar="PROVIDER=N",
+            help="Maximum of requests to the provider per second, eg. vimeo=5.",
+        )
+        parser.add_argument(
+            "--max-age",
+            type=float,
+            metavar="DAYS",
+            help="Skip videos checked in given number of days. Requires "
+            "checked_field.",
+        )
+        parser.add_argument(
+            "--report",
+            metavar="PATH",
+            help="Append results to CSV file.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            metavar="PATH",
+            help="Resume interrupted scan from the file and save progress to "
+            "it. The file is removed when the scan is finished.",
+        )
+
+    def handle(self, *args, **options):
+        if options["workers"] < 1 or options["batch_size"] < 1:
+            raise CommandError("Number of workers and batch size must be positive.")
+
+        fields = []
+        for model, field in get_video_fields(get_models(options["models"])):
+            if not field.status_field and not options["report"]:
+                self.stderr.write(
+                    "Skipping {0}, set its status_field or --report.".format(
+                        self.label(field)
+                    )
+                )
+                continue
+            fields.append((model, field))
+            if options["max_age"] is not None and not field.checked_field:
+                raise CommandError(
+                    "--max-age requires checked_field of {0}.".format(self.label(field))
+                )
+
+        self.options = options
+        self.limits = parse_limits(options["provider_limit"])
+        self.limiters = {
+            provider: utils.RateLimiter(rate)
+            for provider, rate in parse_limits(options["rate"], type=float).items()
+        }
+        self.stats = collections.Counter()
+        self.checkpoint = self.load_checkpoint()
+
+        with self.open_report() as report:
+            self.report = report
+            for model, field in fields:
+                self.scan(model, field)
+
+        if options["checkpoint"] and os.path.exists(options["checkpoint"]):
+            os.remove(options["checkpoint"])
+        self.stdout.write(
+            ", ".join(
+                "{0}: {1}".format(status, count)
+                for status, count in sorted(self.stats.items())
+            )
+            or "Nothing to check."
+        )
+
+    @staticmethod
+    def label(field):
+        return "{0}.{1}".format(field.model._meta.label, field.name)
+
+    def load_checkpoint(self):
+        path = self.options["checkpoint"]
+        if not path or not os.path.exists(path):
+            return {"last_pk": {}, "done": []}
+        with open(path) as f:
+            return json.load(f)
+
+    def save_checkpoint(self):
+        path = self.options["checkpoint"]
+        if not path:
+            return
+        # Replace the file at once, so interruption doesn't leave it broken.
+        # Primary keys which aren't JSON types (eg. UUID) are stored as
+        # strings, filters accept them too.
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.checkpoint, f, default=str)
+        os.replace(path + ".tmp", path)
+
+    def open_report(self):
+        path = self.options["report"]
+        if not path:
+            return open(os.devnull, "w")
+        exists = os.path.exists(path) and os.path.getsize(path)
+        report = open(path, "a", newline="")
+        if not exists:
+            csv.writer(report).writerow(["field", "pk", "url", "status"])
+        return report
+
+    def get_queryset(self, model, field):
+        queryset = (
+            model._default_manager.order_by("pk")
+            .exclude(**{field.attname: ""})
+            .exclude(**{field.attname + "__isnull": True})
+        )
+        if self.options["max_age"] is not None:
+            checked_before = timezone.now() - datetime.timedelta(
+                days=self.options["max_age"]
+            )
+            queryset = queryset.filter(
+                Q(**{field.checked_field + "__isnull": True})
+                | Q(**{field.checked_field + "__lt": checked_before})
+            )
+        return queryset.values_list("pk", field.attname)
+
+    def scan(self, model, field):
+        """
+        Checks videos of the field in batches ordered by primary key. Progress
+        is saved to checkpoint after each batch.
+        """
+        label = self.label(field)
+        if label in self.checkpoint["done"]:
+            return
+
+        queryset = self.get_queryset(model, field)
+        last_pk = self.checkpoint["last_pk"].get(label)
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            rows = list(batch[: self.options["batch_size"]])
+            if not rows:
+                break
+
+            statuses = self.check({url for pk, url in rows})
+            self.save_statuses(model, field, rows, statuses)
+
+            last_pk = rows[-1][0]
+            self.checkpoint["last_pk"][label] = last_pk
+            self.save_checkpoint()
+            if self.options["verbosity"] >= 2:
+                self.stdout.write("{0}: checked up to pk {1}".format(label, last_pk))
+
+        self.checkpoint["done"].append(label)
+        self.save_checkpoint()
+
+    def check(self, urls):
+        """
+        Returns statuses of given URLs.
+
+        :type urls: set[str]
+        :rtype: dict
+        """
+        statuses = {}
+        backends = []
+        for url in urls:
+            try:
+                backends.append((url, detect_backend(url)))
+            except UnknownBackendException:
+                statuses[url] = STATUS_INVALID
+
+        for (url, backend), future in utils.map_concurrently(
+            self.check_backend,
+            backends,
+            max_pending=self.options["workers"],
+            group=lambda item: item[1].get_provider_name(),
+            limits=self.limits,
+        ):
+            try:
+                statuses[url] = future.result()
+            except (EmbedVideoException, requests.RequestException) as e:
+                statuses[url] = STATUS_ERROR
+                if self.options["verbosity"] >= 2:
+                    self.stderr.write("{0}: {1!r}".format(url, e))
+        return statuses
+
+    def check_backend(self, item):
+        url, backend = item
+        limiter = self.limiters.get(backend.get_provider_name())
+        if limiter is not None:
+            limiter.wait()
+
+        try:
+            return STATUS_OK if backend.exists() else STATUS_MISSING
+        except UnknownIdException:
+            return STATUS_INVALID
+        except NotImplementedError:
+            return STATUS_UNKNOWN
+
+    def save_statuses(self, model, field, rows, statuses):
+        pks = collections.defaultdict(list)
+        writer = csv.writer(self.report)
+        for pk, url in rows:
+            status = statuses[url]
+            pks[status].append(pk)
+            writer.writerow([self.label(field), pk, url, status])
+            self.stats[status] += 1
+        self.report.flush()
+
+        if not field.status_field:
+            return
+        now = timezone.now()
+        for status, status_pks in pks.items():
+            if status == STATUS_ERROR:
+                continue
+            values = {field.status_field: status}
+            if field.checked_field:
+                values[field.checked_field] = now
+            model._default_manager.filter(pk__in=status_pks).update(**values)
@@ -0,0 +1,190 @@
+import collections
+import time
+import zlib
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from embed_video import cache, utils
+from embed_video.backends import (
+    EmbedVideoException,
+    VideoDoesntExistException,
+    detect_backend,
+)
+from embed_video.fields import get_video_fields
+from embed_video.management.base import get_models, parse_limits, parse_shard
+from embed_video.settings import EMBED_VIDEO_MAX_WORKERS
+
+
+def in_shard(key, shard):
+    """
+    Decides if video with given cache key belongs to shard ``(i, N)``. Videos
+    are distributed the same way on all nodes.
+
+    :type key: str
+    :type shard: tuple[int, int] | None
+    :rtype: bool
+    """
+    if shard is None:
+        return True
+    index, count = shard
+    return zlib.crc32(key.encode("utf-8")) % count == index - 1
+
+
+def warm(backend):
+    """
+    Loads data of backend fetched from remote servers, which are stored in
+    :setting:`EMBED_VIDEO_CACHE`.
+
+    :type backend: embed_video.backends.VideoBackend
+    """
+    try:
+        backend.info
+    except NotImplementedError:
+        pass
+    backend.thumbnail
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills cache set by EMBED_VIDEO_CACHE with data of videos stored in "
+        "EmbedVideoField fields."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            metavar="app_label[.ModelName]",
+            help="Warm only videos of given applications or models.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of rows loaded from database at once.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=EMBED_VIDEO_MAX_WORKERS,
+            help="Maximum of videos fetched at once.",
+        )
+        parser.add_argument(
+            "--provider-limit",
+            action="append",
+            default=[],
+            metavar="PROVIDER=N",
+            help="Maximum of videos of the provider fetched at once, eg. vimeo=2.",
+        )
+        parser.add_argument(
+            "--shard",
+            metavar="i/N",
+            help="Warm only i-th of N parts of videos, eg. 1/4.",
+        )
+        parser.add_argument(
+            "--report-interval",
+            type=float,
+            default=10,
+            help="Seconds between progress reports.",
+        )
+
+    def handle(self, *args, **options):
+        if cache.get_cache() is None:
+            raise CommandError("EMBED_VIDEO_CACHE is not set, nothing to warm.")
+        if options["workers"] < 1 or options["chunk_size"] < 1:
+            raise CommandError("Number of workers and chunk size must be positive.")
+
+        shard = parse_shard(options["shard"]) if options["shard"] else None
+        limits = parse_limits(options["provider_limit"])
+        self.report_interval = options["report_interval"]
+        self.stats = collections.Counter()
+        self.providers = collections.Counter()
+        self.started = self.reported = time.monotonic()
+
+        backends = self.get_backends(
+            get_video_fields(get_models(options["models"])),
+            shard,
+            options["chunk_size"],
+        )
+        for backend, future in utils.map_concurrently(
+            warm,
+            backends,
+            max_pending=options["workers"],
+            group=lambda backend: backend.get_provider_name(),
+            limits=limits,
+        ):
+            self.providers[backend.get_provider_name()] += 1
+            try:
+                future.result()
+            except VideoDoesntExistException:
+                self.stats["missing"] += 1
+            except (EmbedVideoException, requests.RequestException) as e:
+                self.stats["failed"] += 1
+                if options["verbosity"] >= 2:
+                    self.stderr.write("{0}: {1!r}".format(backend._url, e))
+            else:
+                self.stats["warmed"] += 1
+            self.report()
+
+        self.report(final=True)
+
+    def get_backends(self, fields, shard, chunk_size):
+        """
+        Yields backends of distinct videos of the shard. Videos are identified
+        by their cache keys, so different URLs of the same video are warmed
+        only once.
+        """
+        seen = set()
+        for model, field in fields:
+            urls = (
+                model._default_manager.order_by()
+                .exclude(**{field.attname: ""})
+                .exclude(**{field.attname + "__isnull": True})
+                .values_list(field.attname, flat=True)
+                .iterator(chunk_size=chunk_size)
+            )
+            for url in urls:
+                try:
+                    backend = detect_backend(url)
+                    key = cache.make_key(
+                        "info", backend.backend, backend.get_cache_key()
+                    )
+                except EmbedVideoException:
+                    self.stats["unknown"] += 1
+                    continue
+                if key in seen:
+                    self.stats["duplicate"] += 1
+                elif in_shard(key, shard):
+                    seen.add(key)
+                    yield backend
+
+    def report(self, final=False):
+        now = time.monotonic()
+        if not final and now - self.reported < self.report_interval:
+            return
+        self.reported = now
+
+        done = sum(self.providers.values())
+        elapsed = now - self.started
+        self.stdout.write(
+            "{done} videos in {elapsed:.1f}s ({rate:.1f}/s): {warmed} warmed, "
+            "{missing} missing, {failed} failed, {duplicate} duplicates, "
+            "{unknown} unknown".format(
+                done=done,
+                elapsed=elapsed,
+                rate=done / elapsed if elapsed else 0,
+                warmed=self.stats["warmed"],
+                missing=self.stats["missing"],
+                failed=self.stats["failed"],
+                duplicate=self.stats["duplicate"],
+                unknown=self.stats["unknown"],
+            )
+        )
+        if final and self.providers:
+            self.stdout.write(
+                ", ".join(
+                    "{0}: {1}".format(provider, count)
+                    for provider, count in sorted(self.providers.items())
+                )
+            )
@@ -12,7 +12,7 @@ EMBED_VIDEO_BACKENDS = getattr(
 """ :type: tuple[str] """
 
 EMBED_VIDEO_TIMEOUT = getattr(settings, "EMBED_VIDEO_TIMEOUT", 10)
-""" :type: int """
+""" :type: int | tuple[int, int] """
 
 EMBED_VIDEO_YOUTUBE_DEFAULT_QUERY = getattr(
     settings, "EMBED_VIDEO_YOUTUBE_DEFAULT_QUERY", "wmode=opaque"
@@ -23,3 +23,76 @@ EMBED_VIDEO_YOUTUBE_CHECK_THUMBNAIL = getattr(
     settings, "EMBED_VIDEO_YOUTUBE_CHECK_THUMBNAIL", True
 )
 """ :type: bool """
+
+EMBED_VIDEO_CACHE = getattr(settings, "EMBED_VIDEO_CACHE", None)
+""" :type: str | None """
+
+EMBED_VIDEO_CACHE_TIMEOUT = getattr(settings, "EMBED_VIDEO_CACHE_TIMEOUT", 3600)
+""" :type: int """
+
+EMBED_VIDEO_CACHE_NEGATIVE_TIMEOUT = getattr(
+    settings, "EMBED_VIDEO_CACHE_NEGATIVE_TIMEOUT", 300
+)
+""" :type: int """
+
+EMBED_VIDEO_CACHE_STALE_TIMEOUT = getattr(
+    settings, "EMBED_VIDEO_CACHE_STALE_TIMEOUT", 0
+)
+""" :type: int """
+
+EMBED_VIDEO_MAX_WORKERS = getattr(settings, "EMBED_VIDEO_MAX_WORKERS", 8)
+""" :type: int """
+
+EMBED_VIDEO_YOUTUBE_CHECK_THUMBNAIL_CONCURRENTLY = getattr(
+    settings, "EMBED_VIDEO_YOUTUBE_CHECK_THUMBNAIL_CONCURRENTLY", False
+)
+""" :type: bool """
+
+EMBED_VIDEO_HTTP_POOL_SIZE = getattr(settings, "EMBED_VIDEO_HTTP_POOL_SIZE", 10)
+""" :type: int """
+
+EMBED_VIDEO_USER_AGENT = getattr(
+    settings, "EMBED_VIDEO_USER_AGENT", "django-embed-video"
+)
+""" :type: str """
+
+EMBED_VIDEO_URL_CACHE_SIZE = getattr(settings, "EMBED_VIDEO_URL_CACHE_SIZE", 1024)
+""" :type: int """
+
+EMBED_VIDEO_MAX_URL_LENGTH = getattr(settings, "EMBED_VIDEO_MAX_URL_LENGTH", 2048)
+""" :type: int """
+
+EMBED_VIDEO_FRAGMENT_CACHE = getattr(settings, "EMBED_VIDEO_FRAGMENT_CACHE", None)
+""" :type: str | None """
+
+EMBED_VIDEO_FRAGMENT_CACHE_TIMEOUT = getattr(
+    settings, "EMBED_VIDEO_FRAGMENT_CACHE_TIMEOUT", 300
+)
+""" :type: int """
+
+EMBED_VIDEO_VALIDATION = getattr(settings, "EMBED_VIDEO_VALIDATION", "cached")
+""" :type: str """
+
+EMBED_VIDEO_VALIDATION_TIMEOUT = getattr(settings, "EMBED_VIDEO_VALIDATION_TIMEOUT", 3)
+""" :type: float """
+
+EMBED_VIDEO_HINTS_HEADER = getattr(settings, "EMBED_VIDEO_HINTS_HEADER", False)
+""" :type: bool """
+
+EMBED_VIDEO_CIRCUIT_BREAKER_FAILURE_RATE = getattr(
+    settings, "EMBED_VIDEO_CIRCUIT_BREAKER_FAILURE_RATE", None
+)
+""" :type: float | None """
+
+EMBED_VIDEO_CIRCUIT_BREAKER_WINDOW = getattr(
+    settings, "EMBED_VIDEO_CIRCUIT_BREAKER_WINDOW", 10
+)
+""" :type: int """
+
+EMBED_VIDEO_CIRCUIT_BREAKER_COOLDOWN = getattr(
+    settings, "EMBED_VIDEO_CIRCUIT_BREAKER_COOLDOWN", 30
+)
+""" :type: float """
+
+EMBED_VIDEO_REQUEST_BUDGET = getattr(settings, "EMBED_VIDEO_REQUEST_BUDGET", 3)
+""" :type: float """
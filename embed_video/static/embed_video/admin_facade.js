@@ -0,0 +1,11 @@
+"use strict";
+// Replaces facade of video in AdminVideoWidget with the player on click.
+document.addEventListener("click", function (event) {
+  var button = event.target.closest(".video-facade-play");
+  if (!button) {
+    return;
+  }
+  var facade = button.closest(".video-facade");
+  var player = facade.querySelector("template").content.cloneNode(true);
+  facade.replaceWith(player);
+});
@@ -1,22 +1,58 @@
+import copy
 import logging
 import re
 
 import requests
+from django.core.cache import caches
 from django.template import Library, Node, TemplateSyntaxError
+from django.template.base import FilterExpression, Variable
+from django.utils import translation
 from django.utils.encoding import smart_str
 from django.utils.safestring import mark_safe
 
+from embed_video import cache, http
 from embed_video.backends import (
+    DegradedCode,
+    EmbedVideoException,
+    ProviderUnavailableException,
     UnknownBackendException,
     VideoBackend,
     VideoDoesntExistException,
     detect_backend,
+    detect_backend_class,
+)
+from embed_video.hints import record_video
+from embed_video.settings import (
+    EMBED_VIDEO_FRAGMENT_CACHE,
+    EMBED_VIDEO_FRAGMENT_CACHE_TIMEOUT,
 )
 
 register = Library()
 
 logger = logging.getLogger(__name__)
 
+_dynamic = object()
+
+# Variables resolved by every Context to the same value.
+_builtins = {"True": True, "False": False, "None": None}
+
+
+def _get_constant(expression):
+    """
+    Returns value of filter expression if it doesn't depend on context,
+    otherwise ``_dynamic``.
+    """
+    if not isinstance(expression, FilterExpression) or expression.filters:
+        return _dynamic
+    var = expression.var
+    if not isinstance(var, Variable):
+        return var
+    if var.lookups is None:
+        return var.literal
+    if len(var.lookups) == 1 and var.lookups[0] in _builtins:
+        return _builtins[var.lookups[0]]
+    return _dynamic
+
 
 @register.tag("video")
 class VideoNode(Node):
@@ -46,6 +82,7 @@ class VideoNode(Node):
         {% video item.video "large" %}
         {% video item.video "340x200" %}
         {% video item.video "100% x 300" query="rel=0&wmode=opaque" %}
+        {% video item.video "large" mode="lite" %}
 
         {% video item.video is_secure=True as my_video %}
             URL: {{ my_video.url }}
@@ -53,6 +90,22 @@ class VideoNode(Node):
             Backend: {{ my_video.backend }}
         {% endvideo %}
 
+    Option ``mode="lite"`` renders only thumbnail with play button, the player
+    is loaded after click (see
+    :py:meth:`~embed_video.backends.VideoBackend.get_lite_code`). Default mode
+    is ``iframe``.
+
+    Origins of videos rendered by shortcut form are recorded for
+    :py:class:`~embed_video.hints.ResourceHintsMiddleware`.
+
+    If :setting:`EMBED_VIDEO_FRAGMENT_CACHE` is set, output of shortcut form
+    for given URL, size, options and request protocol is cached.
+
+    Literal arguments are processed once, when template is compiled. Size and
+    options are validated, and backend of literal URL is detected beforehand,
+    so invalid size raises :py:exc:`~django.template.TemplateSyntaxError`
+    already during compilation.
+
     """
 
     error_msg = (
@@ -60,6 +113,7 @@ class VideoNode(Node):
         "[size] [key1=val1 key2=val2 ...] [as var] %}``"
     )
     default_size = "small"
+    modes = {"iframe": "get_embed_code", "lite": "get_lite_code"}
 
     re_size = re.compile(r'[\'"]?(?P<width>\d+%?) *x *(?P<height>\d+%?)[\'"]?')
     re_option = re.compile(r"^(?P<key>[\w]+)=(?P<value>.+)$")
@@ -86,6 +140,14 @@ class VideoNode(Node):
 
         self.size = self.pop_bit() if self.bits and "=" not in self.bits[0] else None
         self.options = self.parse_options(self.bits)
+        if "mode" in self.options:
+            mode = _get_constant(self.options["mode"])
+            if mode is not _dynamic:
+                self.check_mode(mode)
+
+        self.static_size = self.get_static_size()
+        self.static_options = self.get_static_options()
+        self.static_backend = self.get_static_backend()
 
     def pop_bit(self, index=0):
         return self.parser.compile_filter(self.bits.pop(index))
@@ -95,10 +157,79 @@ class VideoNode(Node):
         for bit in bits:
             parsed_bit = self.re_option.match(bit)
             key = smart_str(parsed_bit.group("key"))
+            if key.startswith("_"):
+                raise TemplateSyntaxError(
+                    "Invalid option `{0}`. {1}".format(key, self.error_msg)
+                )
             value = self.parser.compile_filter(parsed_bit.group("value"))
             options[key] = value
         return options
 
+    @classmethod
+    def check_mode(cls, mode):
+        """
+        :type mode: str | None
+        """
+        if mode is not None and mode not in cls.modes:
+            raise TemplateSyntaxError(
+                "Unknown mode `{0}`. Possible modes are {1}.".format(
+                    mode, ", ".join(cls.modes)
+                )
+            )
+
+    @classmethod
+    def pop_mode(cls, options):
+        """
+        Returns mode and the other options.
+
+        :type options: dict
+        :rtype: tuple[str | None, dict]
+        """
+        if "mode" not in options:
+            return None, options
+        options = dict(options)
+        mode = options.pop("mode")
+        cls.check_mode(mode)
+        return mode, options
+
+    def get_static_size(self):
+        """
+        Returns (width, height) if size is literal, otherwise ``None``.
+
+        :rtype: tuple[int, int] | None
+        """
+        value = _get_constant(self.size) if self.size else None
+        return None if value is _dynamic else self.get_size(value)
+
+    def get_static_options(self):
+        """
+        Returns options if all of them are literals, otherwise ``None``.
+
+        :rtype: dict | None
+        """
+        options = {key: _get_constant(value) for key, value in self.options.items()}
+        return None if _dynamic in options.values() else options
+
+    def get_static_backend(self):
+        """
+        Returns backend of literal URL with precomputed code, which is copied
+        on each render. Returns ``None`` if URL isn't literal or its backend
+        can't be detected without network access.
+
+        :rtype: VideoBackend | None
+        """
+        url = _get_constant(self.url)
+        if not isinstance(url, str):
+            return None
+
+        try:
+            backend = detect_backend_class(url)(url)
+            if backend.has_local_code():
+                backend.code
+        except EmbedVideoException:
+            return None
+        return backend
+
     def render(self, context):
         """
         Returns generated HTML.
@@ -109,18 +240,41 @@ class VideoNode(Node):
         :rtype: django.utils.safestring.SafeText | str
         """
         url = self.url.resolve(context)
-        size = self.size.resolve(context) if self.size else None
-        options = self.resolve_options(context)
+        size = self.static_size or self.get_size(self.size.resolve(context))
+        options = (
+            self.resolve_options(context)
+            if self.static_options is None
+            else self.static_options
+        )
 
         try:
             if not self.variable_name:
-                return self.embed(url, size, context=context, **options)
-            backend = self.get_backend(url, context=context, **options)
+                cache_key = self.get_cache_key(url, size, context=context, **options)
+                output = self.get_cached_output(cache_key)
+                if output is None:
+                    mode, options = self.pop_mode(options)
+                    backend = self.get_backend(
+                        self.get_url_backend(url), context=context, **options
+                    )
+                    output = self.embed_backend(backend, size, cache_key, mode)
+                record_video(url)
+                return output
+            _, options = self.pop_mode(options)
+            backend = self.get_backend(
+                self.get_url_backend(url), context=context, **options
+            )
             return self.render_block(context, backend)
+        except http.BudgetExceededException:
+            logger.warning(
+                "Time budget of requests spent before rendering embed video "
+                "(`{0}`)".format(url)
+            )
         except requests.Timeout:
             logger.exception(
                 "Timeout reached during rendering embed video (`{0}`)".format(url)
             )
+        except ProviderUnavailableException:
+            logger.warning("Provider of embed video is unavailable (`{0}`)".format(url))
         except UnknownBackendException:
             logger.warning("Backend wasn't recognised (`{0}`)".format(url))
         except VideoDoesntExistException:
@@ -139,6 +293,16 @@ class VideoNode(Node):
             options[key] = value.resolve(context)
         return options
 
+    def get_url_backend(self, url):
+        """
+        Returns precomputed backend for literal URL, otherwise the given URL.
+        :py:meth:`get_backend` copies it before setting options.
+
+        :type url: str | VideoBackend
+        :rtype: str | VideoBackend
+        """
+        return url if self.static_backend is None else self.static_backend
+
     def render_block(self, context, backend):
         """
         :param context: Django template RequestContext
@@ -159,7 +323,9 @@ class VideoNode(Node):
         Returns instance of VideoBackend. If context is passed to the method
         and request is secure, than the is_secure mark is set to backend.
 
-        A string or VideoBackend instance can be passed to the method.
+        A string or VideoBackend instance can be passed to the method. Given
+        instance is copied, so options don't change the instance shared with
+        other tags (eg. ``post.video_backend``).
 
         :param backend: Given instance inherited from VideoBackend or url
         :type backend_or_url: VideoBackend | str
@@ -168,11 +334,10 @@ class VideoNode(Node):
         :rtype: VideoBackend
         """
 
-        backend = (
-            backend_or_url
-            if isinstance(backend_or_url, VideoBackend)
-            else detect_backend(str(backend_or_url))
-        )
+        if isinstance(backend_or_url, VideoBackend):
+            backend = copy.copy(backend_or_url)
+        else:
+            backend = detect_backend(str(backend_or_url))
 
         if context and "request" in context:
             backend.is_secure = context["request"].is_secure()
@@ -193,9 +358,83 @@ class VideoNode(Node):
         :param context: Django template RequestContext
         :type context: django.template.RequestContext | None
         """
-        backend = cls.get_backend(url, context=context, **options)
-        width, height = cls.get_size(size)
-        return mark_safe(backend.get_embed_code(width=width, height=height))
+        cache_key = cls.get_cache_key(url, size, context=context, **options)
+        output = cls.get_cached_output(cache_key)
+        if output is None:
+            mode, options = cls.pop_mode(options)
+            backend = cls.get_backend(url, context=context, **options)
+            output = cls.embed_backend(backend, cls.get_size(size), cache_key, mode)
+        record_video(url)
+        return output
+
+    @classmethod
+    def embed_backend(cls, backend, size, cache_key=None, mode=None):
+        """
+        Returns embed code of backend and stores it in
+        :setting:`EMBED_VIDEO_FRAGMENT_CACHE` under ``cache_key``, unless it
+        is :py:class:`~embed_video.backends.DegradedCode`.
+
+        :type backend: VideoBackend
+        :type size: tuple[int, int]
+        :type cache_key: str | None
+        :param mode: ``iframe`` (default) or ``lite``
+        :type mode: str | None
+        :rtype: django.utils.safestring.SafeText
+        """
+        width, height = size
+        get_code = getattr(backend, cls.modes[mode or "iframe"])
+        output = get_code(width=width, height=height)
+        if cache_key and not isinstance(output, DegradedCode):
+            caches[EMBED_VIDEO_FRAGMENT_CACHE].set(
+                cache_key, str(output), EMBED_VIDEO_FRAGMENT_CACHE_TIMEOUT
+            )
+        return mark_safe(output)
+
+    @staticmethod
+    def get_cached_output(cache_key):
+        """
+        Returns embed code stored under ``cache_key`` or ``None``.
+
+        :type cache_key: str | None
+        :rtype: django.utils.safestring.SafeText | None
+        """
+        if not cache_key:
+            return None
+        output = caches[EMBED_VIDEO_FRAGMENT_CACHE].get(cache_key)
+        return None if output is None else mark_safe(output)
+
+    @staticmethod
+    def get_cache_key(url, size, context=None, **options):
+        """
+        Returns key of rendered embed code in
+        :setting:`EMBED_VIDEO_FRAGMENT_CACHE` or ``None`` if it shouldn't be
+        cached.
+
+        :type url: str | VideoBackend
+        :type size: str | tuple[int, int] | None
+        :type context: django.template.RequestContext | None
+        :rtype: str | None
+        """
+        if EMBED_VIDEO_FRAGMENT_CACHE is None or isinstance(url, VideoBackend):
+            return None
+
+        url = str(url)
+        backend = detect_backend_class(url)
+        is_secure = (
+            context["request"].is_secure() if context and "request" in context else None
+        )
+        identifier = repr(
+            (
+                url,
+                size,
+                sorted(options.items()),
+                is_secure,
+                translation.get_language(),
+                backend.template_name,
+                backend.lite_template_name,
+            )
+        )
+        return cache.make_key("embed", backend.__name__, identifier)
 
     @classmethod
     def get_size(cls, value):
@@ -0,0 +1,82 @@
+import asyncio
+from unittest import TestCase
+from unittest.mock import patch
+
+import requests_mock
+from django.core.cache import caches
+
+from embed_video.backends import (
+    VideoBackend,
+    VimeoBackend,
+    YoutubeBackend,
+    adetect_backend,
+)
+
+
+class AsyncBackendTestCase(TestCase):
+    def test_adetect_backend(self):
+        backend = asyncio.run(adetect_backend("http://youtu.be/jsrRJyHBvzw"))
+        self.assertIsInstance(backend, YoutubeBackend)
+
+    def test_aget_info(self):
+        backend = VimeoBackend("https://vimeo.com/72304002")
+        with requests_mock.Mocker() as m:
+            m.get("https://vimeo.com/api/v2/video/72304002.json", text='[{"id": 1}]')
+            self.assertEqual(asyncio.run(backend.aget_info()), {"id": 1})
+
+    @patch("embed_video.cache.EMBED_VIDEO_CACHE", "default")
+    def test_aget_info_cached(self):
+        caches["default"].clear()
+        url = "https://vimeo.com/api/v2/video/72304002.json"
+        with requests_mock.Mocker() as m:
+            m.get(url, text='[{"id": 1}]')
+            VimeoBackend("https://vimeo.com/72304002").info
+            for i in range(3):
+                backend = VimeoBackend("https://vimeo.com/72304002")
+                self.assertEqual(asyncio.run(backend.aget_info()), {"id": 1})
+            self.assertEqual(m.call_count, 1)
+
+    def test_aget_thumbnail_url(self):
+        async def thumbnails():
+            return await asyncio.gather(
+                VimeoBackend("https://vimeo.com/1").aget_thumbnail_url(),
+                VimeoBackend("https://vimeo.com/2").aget_thumbnail_url(),
+            )
+
+        with requests_mock.Mocker() as m:
+            for code in ("1", "2"):
+                m.get(
+                    "https://vimeo.com/api/v2/video/%s.json" % code,
+                    text='[{"thumbnail_large": "thumb%s"}]' % code,
+                )
+            self.assertEqual(asyncio.run(thumbnails()), ["thumb1", "thumb2"])
+
+    def test_aget_embed_code(self):
+        backend = YoutubeBackend("http://youtu.be/jsrRJyHBvzw")
+        self.assertEqual(
+            asyncio.run(backend.aget_embed_code(100, 200)),
+            backend.get_embed_code(100, 200),
+        )
+
+    def test_async_only_backend(self):
+        class AsyncBackend(VideoBackend):
+            async def aget_info(self):
+                return {"foo": "bar"}
+
+        backend = AsyncBackend("https://www.example.com")
+        self.assertEqual(backend.get_info(), {"foo": "bar"})
+        self.assertEqual(backend.info, {"foo": "bar"})
+        self.assertEqual(asyncio.run(backend.aget_info()), {"foo": "bar"})
+
+    def test_sync_only_backend(self):
+        class SyncBackend(VideoBackend):
+            def get_info(self):
+                return {"foo": "bar"}
+
+        backend = SyncBackend("https://www.example.com")
+        self.assertEqual(asyncio.run(backend.aget_info()), {"foo": "bar"})
+
+    def test_not_implemented_aget_info(self):
+        backend = VideoBackend("https://www.example.com")
+        with self.assertRaises(NotImplementedError):
+            asyncio.run(backend.aget_info())
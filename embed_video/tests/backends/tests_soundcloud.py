@@ -4,6 +4,9 @@ from unittest.mock import patch
 
 import requests
 import requests_mock
+from django.http import HttpRequest
+from django.template.base import Template
+from django.template.context import RequestContext
 
 from embed_video.backends import (
     SoundCloudBackend,
@@ -144,6 +147,32 @@ class SoundCloudBackendTestCase(TestCase):
     def test_get_url(self):
         self.assertEqual(self.foo.get_url(), self.foo.url)
 
+    def test_info_fetched_once(self):
+        url = self.urls[0]
+        with requests_mock.Mocker() as m:
+            m.get(url[2], text=url[3])
+            backend = self.instance(url[0])
+            backend.get_url()
+            backend.get_code()
+            backend.get_thumbnail_url()
+            backend.width
+            backend.height
+            self.assertEqual(m.call_count, 1)
+
+    def test_template_fetches_info_once(self):
+        url = self.urls[0]
+        template = Template(
+            "{% load embed_video_tags %}"
+            "{% video url as sc %}"
+            "{{ sc.url }} {{ sc.code }} {{ sc.thumbnail }} {% video sc 'small' %}"
+            "{% endvideo %}"
+        )
+        with requests_mock.Mocker() as m:
+            m.get(url[2], text=url[3])
+            output = template.render(RequestContext(HttpRequest(), {"url": url[0]}))
+            self.assertEqual(m.call_count, 1)
+        self.assertIn(url[1], output)
+
     @patch("embed_video.backends.EMBED_VIDEO_TIMEOUT", 0.000001)
     def test_timeout_in_get_info(self):
         backend = SoundCloudBackend(
@@ -1,6 +1,46 @@
+import copy
+import os
+import re
+import tempfile
+from types import SimpleNamespace
 from unittest import TestCase
+from unittest.mock import Mock, patch
 
-from embed_video.backends import UnknownBackendException, VideoBackend, detect_backend
+import requests
+import requests_mock
+from django.conf import settings
+from django.core.cache import caches
+from django.template import RequestContext, Template
+from django.template.loader import render_to_string
+from django.test import override_settings
+from django.test.client import RequestFactory
+from django.utils.safestring import mark_safe
+
+from embed_video import http
+from embed_video.backends import (
+    ProviderUnavailableException,
+    SoundCloudBackend,
+    UnknownBackendException,
+    UnknownIdException,
+    VideoBackend,
+    VideoDoesntExistException,
+    VimeoBackend,
+    YoutubeBackend,
+    clear_url_cache,
+    detect_backend,
+    get_backend_index,
+    get_circuit_breaker,
+    get_hostname,
+    get_url_cache_info,
+    render_stock_embed_code,
+    response_exists,
+    uses_stock_template,
+)
+from embed_video.fields import prefetch_videos
+
+
+class SpecialBackend(VideoBackend):
+    re_detect = re.compile(r"^https://www\.youtube\.com/special/")
 
 
 class VideoBackendTestCase(TestCase):
@@ -18,3 +58,407 @@ class VideoBackendTestCase(TestCase):
     def test_not_implemented_get_info(self):
         backend = VideoBackend("https://www.example.com")
         self.assertRaises(NotImplementedError, backend.get_info)
+
+
+class BackendIndexTestCase(TestCase):
+    backend_names = (
+        "embed_video.tests.backends.tests_videobackend.SpecialBackend",
+        "embed_video.backends.YoutubeBackend",
+        "embed_video.backends.VimeoBackend",
+        "embed_video.backends.SoundCloudBackend",
+    )
+
+    def test_get_hostname(self):
+        self.assertEqual(get_hostname("https://www.YouTube.com/watch"), "youtube.com")
+        self.assertEqual(get_hostname("m.youtube.com/watch"), "youtube.com")
+        self.assertEqual(get_hostname("//player.vimeo.com/video/1"), "player.vimeo.com")
+        self.assertEqual(get_hostname("http://vimeo.com:80/1"), "vimeo.com")
+        self.assertIsNone(get_hostname(""))
+        self.assertIsNone(get_hostname("http://[foo/"))
+
+    def test_index(self):
+        backends, index = get_backend_index(self.backend_names)
+        self.assertEqual(
+            backends, [SpecialBackend, YoutubeBackend, VimeoBackend, SoundCloudBackend]
+        )
+        self.assertEqual(index["youtube.com"], [SpecialBackend, YoutubeBackend])
+        self.assertEqual(index["youtu.be"], [SpecialBackend, YoutubeBackend])
+        self.assertEqual(index["vimeo.com"], [SpecialBackend, VimeoBackend])
+        self.assertEqual(index["soundcloud.com"], [SpecialBackend, SoundCloudBackend])
+
+    def test_backends_imported_once(self):
+        clear_url_cache()
+        get_backend_index.cache_clear()
+        with patch("embed_video.backends.import_string") as import_string:
+            import_string.return_value = YoutubeBackend
+            for i in range(3):
+                detect_backend("http://youtu.be/jsrRJyHBvzw")
+        get_backend_index.cache_clear()
+        self.assertEqual(import_string.call_count, 4)
+
+    def test_unindexed_backend_keeps_order(self):
+        with override_settings(EMBED_VIDEO_BACKENDS=self.backend_names):
+            self.assertIsInstance(
+                detect_backend("https://www.youtube.com/special/jsrRJyHBvzw"),
+                SpecialBackend,
+            )
+            self.assertIsInstance(
+                detect_backend("https://www.youtube.com/watch?v=jsrRJyHBvzw"),
+                YoutubeBackend,
+            )
+
+    def test_only_candidates_are_tried(self):
+        with patch.object(YoutubeBackend, "is_valid") as is_valid:
+            detect_backend("https://soundcloud.com/foo/bar")
+        is_valid.assert_not_called()
+
+
+class UrlCacheTestCase(TestCase):
+    url = "https://www.youtube.com/watch?v=jsrRJyHBvzw"
+
+    def setUp(self):
+        clear_url_cache()
+
+    def test_detect_backend(self):
+        for i in range(3):
+            self.assertIsInstance(detect_backend(self.url), YoutubeBackend)
+        info = get_url_cache_info()["backends"]
+        self.assertEqual((info.hits, info.misses), (2, 1))
+
+    def test_unknown_backend(self):
+        with patch.object(VimeoBackend, "is_valid", return_value=False) as is_valid:
+            for i in range(2):
+                with self.assertRaises(UnknownBackendException):
+                    detect_backend("https://vimeo.com/foo")
+        self.assertEqual(is_valid.call_count, 1)
+
+    def test_code(self):
+        with patch.object(
+            YoutubeBackend, "parse_code", return_value="jsrRJyHBvzw"
+        ) as parse_code:
+            for i in range(3):
+                self.assertEqual(YoutubeBackend(self.url).code, "jsrRJyHBvzw")
+        self.assertEqual(parse_code.call_count, 1)
+        info = get_url_cache_info()["codes"]
+        self.assertEqual((info.hits, info.misses), (2, 1))
+
+    def test_unknown_id(self):
+        backend = YoutubeBackend("https://www.youtube.com/watch?foo=bar")
+        for i in range(2):
+            with self.assertRaisesRegex(UnknownIdException, "Cannot get ID"):
+                backend.get_code()
+        self.assertEqual(get_url_cache_info()["codes"].hits, 1)
+
+    def test_clear(self):
+        detect_backend(self.url)
+        clear_url_cache()
+        self.assertEqual(get_url_cache_info()["backends"].currsize, 0)
+
+    def test_override_settings(self):
+        detect_backend(self.url)
+        with override_settings(
+            EMBED_VIDEO_BACKENDS=("embed_video.backends.VimeoBackend",)
+        ):
+            self.assertEqual(get_url_cache_info()["backends"].currsize, 0)
+            with self.assertRaises(UnknownBackendException):
+                detect_backend(self.url)
+        self.assertIsInstance(detect_backend(self.url), YoutubeBackend)
+
+
+class DerivedValuesTestCase(TestCase):
+    def setUp(self):
+        self.backend = YoutubeBackend("https://www.youtube.com/watch?v=jsrRJyHBvzw")
+
+    def test_memoized(self):
+        with patch.object(
+            YoutubeBackend, "get_code", return_value="jsrRJyHBvzw"
+        ) as get_code:
+            for i in range(3):
+                self.backend.code
+                self.backend.url
+        self.assertEqual(get_code.call_count, 1)
+
+    def test_thumbnail_memoized(self):
+        with patch.object(YoutubeBackend, "get_thumbnail_url") as get_thumbnail_url:
+            self.backend.thumbnail
+            self.backend.thumbnail
+        self.assertEqual(get_thumbnail_url.call_count, 1)
+
+    def test_invalidate_query(self):
+        self.assertEqual(
+            self.backend.url, "https://www.youtube.com/embed/jsrRJyHBvzw?wmode=opaque"
+        )
+        self.backend.query = "rel=0"
+        self.assertEqual(
+            self.backend.url, "https://www.youtube.com/embed/jsrRJyHBvzw?rel=0"
+        )
+
+    def test_invalidate_is_secure(self):
+        backend = VimeoBackend("https://vimeo.com/72304002")
+        self.assertEqual(backend.url, "https://player.vimeo.com/video/72304002")
+        backend.is_secure = False
+        self.assertEqual(backend.url, "http://player.vimeo.com/video/72304002")
+
+    def test_same_value_keeps_derived(self):
+        with patch.object(YoutubeBackend, "get_thumbnail_url") as get_thumbnail_url:
+            self.backend.thumbnail
+            self.backend.is_secure = True
+            self.backend.set_options({"is_secure": True})
+            self.backend.thumbnail
+        self.assertEqual(get_thumbnail_url.call_count, 1)
+
+    def test_prefetched_backend_rendered_by_tag(self):
+        template = Template(
+            "{% load embed_video_tags %}"
+            "{% video item.video_backend as v %}{{ v.thumbnail }}{% endvideo %}"
+        )
+        item = SimpleNamespace(video="https://youtu.be/jsrRJyHBvzw")
+        request = RequestFactory().get("/", secure=True)
+        with patch.object(
+            YoutubeBackend, "get_thumbnail_url", return_value="thumb.jpg"
+        ) as get_thumbnail_url:
+            prefetch_videos([item], "video", thumbnails=True)
+            for i in range(3):
+                output = template.render(
+                    RequestContext(request, {"item": item, "request": request})
+                )
+                self.assertEqual(output, "thumb.jpg")
+        self.assertEqual(get_thumbnail_url.call_count, 1)
+
+    def test_copy(self):
+        url = self.backend.url
+        backend = copy.copy(self.backend)
+        backend.query["rel"] = "0"
+        backend.is_secure = False
+        self.assertEqual(
+            backend.url, "http://www.youtube.com/embed/jsrRJyHBvzw?wmode=opaque&rel=0"
+        )
+        self.assertEqual(self.backend.url, url)
+        self.assertEqual(self.backend.query.urlencode(), "wmode=opaque")
+
+    def test_invalidate_set_options(self):
+        self.backend.url
+        self.backend.set_options({"is_secure": False, "query": ""})
+        self.assertEqual(self.backend.url, "http://www.youtube.com/embed/jsrRJyHBvzw")
+
+
+class StockEmbedCodeTestCase(TestCase):
+    values = (
+        ("https://www.youtube.com/embed/jsrRJyHBvzw?a=1&b=2", 480, 360),
+        ('https://vimeo.com/"><script>', "100%", "50"),
+        (mark_safe("https://vimeo.com/?a=1&amp;b=2"), 1280.5, None),
+    )
+
+    def render_template(self, url, width, height):
+        return render_to_string(
+            "embed_video/embed_code.html",
+            {"backend": {"url": url}, "width": width, "height": height},
+        )
+
+    def test_byte_identical(self):
+        for url, width, height in self.values:
+            self.assertEqual(
+                render_stock_embed_code(url, width, height),
+                self.render_template(url, width, height),
+            )
+
+    @override_settings(USE_THOUSAND_SEPARATOR=True)
+    def test_byte_identical_localized(self):
+        self.assertEqual(
+            render_stock_embed_code("https://vimeo.com/", 12800, 9600),
+            self.render_template("https://vimeo.com/", 12800, 9600),
+        )
+
+    def test_uses_stock_template(self):
+        self.assertTrue(uses_stock_template("embed_video/embed_code.html"))
+        self.assertFalse(uses_stock_template("custom/embed_code.html"))
+
+    def test_embed_code(self):
+        backend = YoutubeBackend("https://www.youtube.com/watch?v=jsrRJyHBvzw")
+        with patch("embed_video.backends.render_to_string") as render:
+            code = backend.get_embed_code(480, 360)
+        render.assert_not_called()
+        self.assertEqual(code, self.render_template(backend.url, 480, 360))
+
+    def test_overridden_template(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.mkdir(os.path.join(directory, "embed_video"))
+            with open(
+                os.path.join(directory, "embed_video", "embed_code.html"), "w"
+            ) as f:
+                f.write("<video src='{{ backend.url }}'>")
+
+            templates = [dict(settings.TEMPLATES[0], DIRS=[directory])]
+            with override_settings(TEMPLATES=templates):
+                backend = VimeoBackend("https://vimeo.com/72304002")
+                self.assertEqual(
+                    backend.get_embed_code(480, 360),
+                    "<video src='https://player.vimeo.com/video/72304002'>",
+                )
+        self.assertTrue(uses_stock_template("embed_video/embed_code.html"))
+
+    def test_custom_template_name(self):
+        backend = YoutubeBackend("https://www.youtube.com/watch?v=jsrRJyHBvzw")
+        backend.template_name = "custom/embed_code.html"
+        with patch(
+            "embed_video.backends.render_to_string", return_value="custom"
+        ) as render:
+            self.assertEqual(backend.get_embed_code(480, 360), "custom")
+        render.assert_called_once()
+
+
+class LiteCodeTestCase(TestCase):
+    def test_lite_code(self):
+        backend = VimeoBackend("https://vimeo.com/72304002")
+        with patch.object(
+            VimeoBackend, "get_info", return_value={"thumbnail_large": "thumb.jpg"}
+        ):
+            code = backend.get_lite_code(480, "100%")
+        self.assertIn("width:480px;height:100%", code)
+        self.assertIn('<img src="thumb.jpg"', code)
+        self.assertIn('src="https://player.vimeo.com/video/72304002?autoplay=1"', code)
+        self.assertEqual(backend.url, "https://player.vimeo.com/video/72304002")
+
+    def test_autoplay_replaces_query(self):
+        backend = VimeoBackend("https://vimeo.com/72304002")
+        backend.query = "autoplay=0&muted=1"
+        with patch.object(VimeoBackend, "get_info", side_effect=requests.Timeout):
+            code = backend.get_lite_code(480, 360)
+        self.assertIn("?autoplay=1&muted=1", code)
+        self.assertNotIn("<img", code)
+
+    def test_youtube_thumbnail_not_checked(self):
+        backend = YoutubeBackend("https://youtu.be/jsrRJyHBvzw")
+        with requests_mock.Mocker() as m:
+            code = backend.get_lite_code(480, 360)
+            self.assertFalse(m.called)
+        self.assertIn(
+            '<img src="https://img.youtube.com/vi/jsrRJyHBvzw/hqdefault.jpg"', code
+        )
+
+    @patch("embed_video.cache.EMBED_VIDEO_CACHE", "default")
+    def test_youtube_cached_thumbnail(self):
+        caches["default"].clear()
+        with requests_mock.Mocker() as m:
+            m.head(requests_mock.ANY)
+            YoutubeBackend("https://youtu.be/jsrRJyHBvzw").thumbnail
+            backend = YoutubeBackend("https://youtu.be/jsrRJyHBvzw")
+            self.assertEqual(
+                backend.get_lite_thumbnail_url(),
+                "https://img.youtube.com/vi/jsrRJyHBvzw/maxresdefault.jpg",
+            )
+            self.assertEqual(m.call_count, 1)
+
+    def test_without_autoplay(self):
+        backend = YoutubeBackend("https://youtu.be/jsrRJyHBvzw")
+        backend.autoplay_query = None
+        with patch.object(YoutubeBackend, "get_thumbnail_url", return_value=None):
+            code = backend.get_lite_code(480, 360)
+        self.assertIn('src="{0}"'.format(backend.url), code)
+
+
+class ExistsTestCase(TestCase):
+    def test_response_exists(self):
+        with requests_mock.Mocker() as m:
+            for status_code, exists in ((200, True), (301, True), (404, False)):
+                m.get("https://example.com/", status_code=status_code)
+                self.assertEqual(
+                    response_exists(requests.get("https://example.com/")), exists
+                )
+            m.get("https://example.com/", status_code=503)
+            with self.assertRaises(requests.HTTPError):
+                response_exists(requests.get("https://example.com/"))
+
+    def test_youtube(self):
+        backend = YoutubeBackend("https://www.youtube.com/watch?v=jsrRJyHBvzw")
+        with requests_mock.Mocker() as m:
+            m.head(
+                "https://img.youtube.com/vi/jsrRJyHBvzw/hqdefault.jpg", status_code=404
+            )
+            self.assertFalse(backend.exists())
+
+    def test_not_cached(self):
+        backend = VimeoBackend("https://vimeo.com/72304002")
+        with requests_mock.Mocker() as m:
+            m.get("https://vimeo.com/api/v2/video/72304002.json", text="[{}]")
+            self.assertTrue(backend.exists())
+            self.assertTrue(backend.exists())
+            self.assertEqual(m.call_count, 2)
+
+    def test_default(self):
+        with patch.object(VideoBackend, "get_info", side_effect=NotImplementedError):
+            with self.assertRaises(NotImplementedError):
+                VideoBackend("https://example.com/").exists()
+        with patch.object(
+            VideoBackend, "get_info", side_effect=VideoDoesntExistException
+        ):
+            self.assertFalse(VideoBackend("https://example.com/").exists())
+
+
+@patch("embed_video.backends.EMBED_VIDEO_CIRCUIT_BREAKER_FAILURE_RATE", 1)
+@patch("embed_video.backends.EMBED_VIDEO_CIRCUIT_BREAKER_WINDOW", 2)
+class CircuitBreakerTestCase(TestCase):
+    info_url = "https://vimeo.com/api/v2/video/72304002.json"
+
+    def setUp(self):
+        get_circuit_breaker.cache_clear()
+        self.addCleanup(get_circuit_breaker.cache_clear)
+
+    def get_info(self):
+        return VimeoBackend("https://vimeo.com/72304002").info
+
+    def test_open_circuit(self):
+        with requests_mock.Mocker() as m:
+            m.get(self.info_url, exc=requests.ConnectTimeout)
+            for i in range(2):
+                with self.assertRaises(requests.Timeout):
+                    self.get_info()
+            with self.assertRaises(ProviderUnavailableException):
+                self.get_info()
+            self.assertEqual(m.call_count, 2)
+
+        # Other backends aren't affected.
+        self.assertIsNot(
+            get_circuit_breaker(VimeoBackend), get_circuit_breaker(SoundCloudBackend)
+        )
+
+    def test_spent_budget_is_not_failure(self):
+        with requests_mock.Mocker() as m, http.budget(0):
+            for i in range(3):
+                with self.assertRaises(http.BudgetExceededException):
+                    self.get_info()
+            self.assertFalse(m.called)
+        self.assertEqual(get_circuit_breaker(VimeoBackend).state, "closed")
+
+    def test_missing_video_is_not_failure(self):
+        with requests_mock.Mocker() as m:
+            m.get(self.info_url, text="")
+            for i in range(3):
+                with self.assertRaises(VideoDoesntExistException):
+                    self.get_info()
+            self.assertEqual(m.call_count, 3)
+
+    def test_server_error_opens_circuit(self):
+        with requests_mock.Mocker() as m:
+            m.get(self.info_url, status_code=503, text="<html></html>")
+            for i in range(2):
+                with self.assertRaises(requests.HTTPError):
+                    self.get_info()
+            with self.assertRaises(ProviderUnavailableException):
+                self.get_info()
+            self.assertEqual(m.call_count, 2)
+
+    def test_unexpected_error_is_not_success(self):
+        backend = VimeoBackend("https://vimeo.com/72304002")
+        breaker = get_circuit_breaker(VimeoBackend)
+        with patch.object(breaker, "record") as record:
+            for exc in (KeyboardInterrupt, RuntimeError):
+                with self.assertRaises(exc):
+                    backend.call_remote(Mock(side_effect=exc))
+        record.assert_not_called()
+
+    def test_disabled(self):
+        with patch(
+            "embed_video.backends.EMBED_VIDEO_CIRCUIT_BREAKER_FAILURE_RATE", None
+        ):
+            self.assertIsNone(get_circuit_breaker(VimeoBackend))
@@ -16,6 +16,7 @@ class VimeoBackendTestCase(TestCase):
         ("https://player.vimeo.com/video/72304002", "72304002"),
         ("http://www.vimeo.com/channels/staffpick/72304002", "72304002"),
         ("https://www.vimeo.com/channels/staffpick/72304002", "72304002"),
+        ("https://vimeo.com/channels/100things/72304002", "72304002"),
         ("https://vimeo.com/exampleusername/review/72304002/a1b2c3d4", "72304002"),
         ("https://vimeo.com/manage/72304002/general", "72304002"),
     )
@@ -32,6 +33,14 @@ class VimeoBackendTestCase(TestCase):
             backend = self.instance(url[0])
             self.assertEqual(backend.code, url[1])
 
+    def test_adversarial_urls(self):
+        n = 1000
+        for url in (
+            "https://vimeo.com/" + "vimeo.com/a" * n,
+            "https://vimeo.com/channels/" + "a/" * n + "b",
+        ):
+            self.assertIsNone(self.instance.parse_code(url))
+
     def test_vimeo_get_info_exception(self):
         with self.assertRaises(VideoDoesntExistException):
             backend = VimeoBackend("https://vimeo.com/123")
@@ -1,7 +1,17 @@
+import threading
 from unittest import TestCase
 from unittest.mock import patch
 
-from embed_video.backends import UnknownIdException, YoutubeBackend, detect_backend
+import requests_mock
+from django.core.cache import caches
+
+from embed_video import utils
+from embed_video.backends import (
+    UnknownBackendException,
+    UnknownIdException,
+    YoutubeBackend,
+    detect_backend,
+)
 
 
 class YoutubeBackendTestCase(TestCase):
@@ -54,6 +64,31 @@ class YoutubeBackendTestCase(TestCase):
             backend = self.instance(url[0])
             self.assertEqual(backend.code, url[1])
 
+    def test_old_url_shapes(self):
+        for url in (
+            "http://www.youtube.com/user/Scobleizer#p/u/1/1p3vcRhsYGo",
+            "http://www.youtube.com/ytscreeningroom?v=1p3vcRhsYGo",
+            "http://gdata.youtube.com/feeds/api/videos/1p3vcRhsYGo",
+        ):
+            self.assertEqual(self.instance.parse_code(url), "1p3vcRhsYGo")
+
+    def test_adversarial_urls(self):
+        n = 1000
+        urls = (
+            "https://youtube.com/" + "youtube.com/user!" * n,
+            "https://youtube.com/user" + "/a" * n,
+            "https://youtube.com/" + "#/" * n,
+            "https://youtube.com/watch?" + "v=&" * n,
+        )
+        for url in urls:
+            self.assertRaises(UnknownIdException, self.instance.parse_code, url)
+
+    @patch("embed_video.backends.EMBED_VIDEO_MAX_URL_LENGTH", 50)
+    def test_max_url_length(self):
+        url = "https://www.youtube.com/watch?v=jsrRJyHBvzw&feature=" + "a" * 50
+        self.assertRaises(UnknownBackendException, detect_backend, url)
+        self.assertRaises(UnknownIdException, self.instance(url).get_code)
+
     def test_youtube_keyerror(self):
         """Test for issue #7"""
         backend = self.instance("http://youtube.com/watch?id=5")
@@ -74,3 +109,75 @@ class YoutubeBackendTestCase(TestCase):
     def test_youtube_not_check_thumbnail(self):
         backend = self.instance("https://www.youtube.com/watch?v=not-exist")
         self.assertIn("img.youtube.com/vi/not-exist/hqdefault.jpg", backend.thumbnail)
+
+    def test_thumbnail_resolution_timeout(self):
+        backend = self.instance("https://www.youtube.com/watch?v=jsrRJyHBvzw")
+        with requests_mock.Mocker() as m:
+            m.head(requests_mock.ANY, status_code=200)
+            with patch("embed_video.backends.EMBED_VIDEO_TIMEOUT", 3):
+                self.assertEqual(
+                    backend.get_thumbnail_resolution(), "maxresdefault.jpg"
+                )
+            self.assertEqual(m.request_history[0].timeout, 3)
+
+
+@patch("embed_video.cache.EMBED_VIDEO_CACHE", "default")
+class YoutubeThumbnailCacheTestCase(TestCase):
+    thumbnail_url = "https://img.youtube.com/vi/jsrRJyHBvzw/{0}"
+
+    def setUp(self):
+        caches["default"].clear()
+
+    def test_resolution_is_cached(self):
+        with requests_mock.Mocker() as m:
+            m.head(self.thumbnail_url.format("maxresdefault.jpg"), status_code=404)
+            m.head(self.thumbnail_url.format("sddefault.jpg"), status_code=200)
+            for url in ("http://youtu.be/jsrRJyHBvzw", "https://youtu.be/jsrRJyHBvzw"):
+                self.assertEqual(
+                    YoutubeBackend(url).thumbnail,
+                    self.thumbnail_url.format("sddefault.jpg"),
+                )
+            self.assertEqual(m.call_count, 2)
+
+    def test_missing_thumbnail_is_cached(self):
+        with requests_mock.Mocker() as m:
+            m.head(requests_mock.ANY, status_code=404)
+            self.assertIsNone(YoutubeBackend("http://youtu.be/jsrRJyHBvzw").thumbnail)
+            self.assertIsNone(YoutubeBackend("http://youtu.be/jsrRJyHBvzw").thumbnail)
+            self.assertEqual(m.call_count, len(YoutubeBackend.resolutions))
+
+
+@patch("embed_video.backends.EMBED_VIDEO_YOUTUBE_CHECK_THUMBNAIL_CONCURRENTLY", True)
+class YoutubeConcurrentThumbnailTestCase(TestCase):
+    thumbnail_url = "https://img.youtube.com/vi/jsrRJyHBvzw/{0}"
+
+    def setUp(self):
+        self.backend = YoutubeBackend("http://youtu.be/jsrRJyHBvzw")
+
+    def test_best_resolution(self):
+        with requests_mock.Mocker() as m:
+            m.head(requests_mock.ANY, status_code=200)
+            m.head(self.thumbnail_url.format("maxresdefault.jpg"), status_code=404)
+            self.assertEqual(self.backend.get_thumbnail_resolution(), "sddefault.jpg")
+
+    def test_no_resolution(self):
+        with requests_mock.Mocker() as m:
+            m.head(requests_mock.ANY, status_code=404)
+            self.assertIsNone(self.backend.get_thumbnail_resolution())
+
+    def test_resolutions_checked_at_once(self):
+        barrier = threading.Barrier(len(YoutubeBackend.resolutions), timeout=5)
+
+        def thumbnail_exists(resolution):
+            barrier.wait()
+            return resolution == "hqdefault.jpg"
+
+        with patch.object(self.backend, "thumbnail_exists", thumbnail_exists):
+            self.assertEqual(self.backend.get_thumbnail_resolution(), "hqdefault.jpg")
+
+    def test_sequential_in_worker(self):
+        with requests_mock.Mocker() as m:
+            m.head(requests_mock.ANY, status_code=200)
+            future = utils.submit(self.backend.get_thumbnail_resolution)
+            self.assertEqual(future.result(), "maxresdefault.jpg")
+            self.assertEqual(m.call_count, 1)
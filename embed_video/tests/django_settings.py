@@ -3,6 +3,9 @@ import os
 DEBUG = True
 SECRET_KEY = "testing_key123"
 
+DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}}
+DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
+
 STATIC_ROOT = MEDIA_ROOT = os.path.join(os.path.dirname(__file__), "static")
 STATIC_URL = MEDIA_URL = "/static/"
 
@@ -24,7 +27,12 @@ TEMPLATES = [
     }
 ]
 
-INSTALLED_APPS = ("django.contrib.contenttypes", "django.contrib.auth", "embed_video")
+INSTALLED_APPS = (
+    "django.contrib.contenttypes",
+    "django.contrib.auth",
+    "embed_video",
+    "embed_video.tests",
+)
 
 
 EMBED_VIDEO_BACKENDS = (
@@ -0,0 +1,173 @@
+import csv
+import datetime
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+import requests_mock
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from embed_video.management.commands.embed_video_scan import Command
+from embed_video.tests.models import UUIDVideoItem, VideoItem
+
+VIMEO_INFO_URL = "https://vimeo.com/api/v2/video/{0}.json"
+YOUTUBE_THUMBNAIL_URL = "https://img.youtube.com/vi/{0}/hqdefault.jpg"
+
+
+class ScanCommandTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.mocker = requests_mock.Mocker()
+        self.mocker.start()
+        self.addCleanup(self.mocker.stop)
+        self.mocker.get(VIMEO_INFO_URL.format(1), text="[{}]")
+        self.mocker.get(VIMEO_INFO_URL.format(2), status_code=404)
+        self.mocker.get(VIMEO_INFO_URL.format(3), status_code=503)
+        self.mocker.head(YOUTUBE_THUMBNAIL_URL.format("jsrRJyHBvzw"))
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def call(self, *args, **options):
+        out = StringIO()
+        call_command(
+            "embed_video_scan", *args, stdout=out, stderr=StringIO(), **options
+        )
+        return out.getvalue()
+
+    def create(self, *urls):
+        return [VideoItem.objects.create(video=url) for url in urls]
+
+    def status(self, item):
+        item.refresh_from_db()
+        return item.video_status
+
+    def test_statuses(self):
+        items = self.create(
+            "https://vimeo.com/1",
+            "https://vimeo.com/2",
+            "https://vimeo.com/3",
+            "https://www.youtube.com/watch?v=jsrRJyHBvzw",
+            "http://example.com/foo",
+            "https://vimeo.com/1",
+        )
+        out = self.call(batch_size=4)
+
+        self.assertEqual(
+            [self.status(item) for item in items],
+            ["ok", "missing", "", "ok", "invalid", "ok"],
+        )
+        self.assertIsNotNone(items[0].video_checked)
+        self.assertIsNone(items[2].video_checked)
+        self.assertEqual(out.strip(), "error: 1, invalid: 1, missing: 1, ok: 3")
+
+    def test_max_age(self):
+        old, recent = self.create("https://vimeo.com/1", "https://vimeo.com/2")
+        VideoItem.objects.filter(pk=old.pk).update(
+            video_checked=timezone.now() - datetime.timedelta(days=10)
+        )
+        VideoItem.objects.filter(pk=recent.pk).update(video_checked=timezone.now())
+
+        self.call("tests.VideoItem", max_age=7)
+        self.assertEqual(self.status(old), "ok")
+        self.assertEqual(self.status(recent), "")
+
+    def test_report(self):
+        items = self.create("https://vimeo.com/1", "https://vimeo.com/3")
+        self.call(report=self.path("report.csv"))
+        self.call(report=self.path("report.csv"))
+
+        with open(self.path("report.csv")) as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["field", "pk", "url", "status"])
+        self.assertEqual(
+            rows[1:3],
+            [
+                ["tests.VideoItem.video", str(items[0].pk), items[0].video, "ok"],
+                ["tests.VideoItem.video", str(items[1].pk), items[1].video, "error"],
+            ],
+        )
+        self.assertEqual(len(rows), 5)
+
+    def test_resume(self):
+        first, second = self.create("https://vimeo.com/1", "https://vimeo.com/2")
+        with open(self.path("checkpoint.json"), "w") as f:
+            json.dump({"last_pk": {"tests.VideoItem.video": first.pk}, "done": []}, f)
+
+        self.call(checkpoint=self.path("checkpoint.json"))
+        self.assertEqual(self.status(first), "")
+        self.assertEqual(self.status(second), "missing")
+        self.assertFalse(os.path.exists(self.path("checkpoint.json")))
+
+    def test_checkpoint(self):
+        item = self.create("https://vimeo.com/1")[0]
+        checkpoints = []
+        save_checkpoint = Command.save_checkpoint
+
+        def record(command):
+            checkpoints.append(json.loads(json.dumps(command.checkpoint)))
+            save_checkpoint(command)
+
+        with patch.object(Command, "save_checkpoint", autospec=True) as mock:
+            mock.side_effect = record
+            self.call("tests.VideoItem", checkpoint=self.path("checkpoint.json"))
+
+        label = "tests.VideoItem.video"
+        self.assertEqual(
+            checkpoints,
+            [
+                {"last_pk": {label: item.pk}, "done": []},
+                {"last_pk": {label: item.pk}, "done": [label]},
+            ],
+        )
+
+    def test_checkpoint_uuid(self):
+        items = [
+            UUIDVideoItem.objects.create(video=url)
+            for url in ("https://vimeo.com/1", "https://vimeo.com/2")
+        ]
+        path = self.path("checkpoint.json")
+        save_checkpoint = Command.save_checkpoint
+
+        def interrupt(command):
+            # Interrupted after the first batch.
+            save_checkpoint(command)
+            raise KeyboardInterrupt
+
+        with patch.object(Command, "save_checkpoint", autospec=True) as mock:
+            mock.side_effect = interrupt
+            with self.assertRaises(KeyboardInterrupt):
+                self.call("tests.UUIDVideoItem", batch_size=1, checkpoint=path)
+
+        with open(path) as f:
+            checkpoint = json.load(f)
+        first = min(items, key=lambda item: item.pk)
+        self.assertEqual(
+            checkpoint["last_pk"], {"tests.UUIDVideoItem.video": str(first.pk)}
+        )
+
+        with patch.object(Command, "check", autospec=True) as check:
+            check.return_value = {
+                "https://vimeo.com/1": "ok",
+                "https://vimeo.com/2": "ok",
+            }
+            self.call("tests.UUIDVideoItem", batch_size=1, checkpoint=path)
+        # Only the second item is checked after resume.
+        check.assert_called_once()
+        self.assertFalse(os.path.exists(path))
+
+    def test_rate(self):
+        self.create("https://vimeo.com/1")
+        self.call(rate=["vimeo=100"], provider_limit=["vimeo=1"])
+        self.assertEqual(self.mocker.call_count, 1)
+
+    def test_invalid_options(self):
+        with self.assertRaises(CommandError):
+            self.call("auth.User", "tests", max_age=1, report=self.path("r.csv"))
+        with self.assertRaises(CommandError):
+            self.call(rate=["vimeo=0"])
@@ -0,0 +1,113 @@
+from io import StringIO
+from json import dumps
+from unittest import TestCase
+from unittest.mock import patch
+
+import requests_mock
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.test import TestCase as DatabaseTestCase
+
+from embed_video import utils
+from embed_video.management.base import parse_limits, parse_shard
+from embed_video.management.commands.embed_video_warm import in_shard
+from embed_video.tests.models import VideoItem
+
+VIMEO_INFO_URL = "https://vimeo.com/api/v2/video/{0}.json"
+
+
+def vimeo_info(code):
+    return dumps([{"id": code, "thumbnail_large": "https://i.vimeocdn.com/x"}])
+
+
+@patch("embed_video.cache.EMBED_VIDEO_CACHE", "default")
+class WarmCommandTestCase(DatabaseTestCase):
+    def setUp(self):
+        caches["default"].clear()
+
+    def call(self, *args, **options):
+        out = StringIO()
+        call_command(
+            "embed_video_warm", *args, stdout=out, stderr=StringIO(), **options
+        )
+        return out.getvalue()
+
+    def test_warm(self):
+        VideoItem.objects.create(video="https://vimeo.com/1")
+        VideoItem.objects.create(video="https://player.vimeo.com/video/1")
+        VideoItem.objects.create(video="https://vimeo.com/2")
+        VideoItem.objects.create(video="http://example.com/foo")
+        VideoItem.objects.create(video="")
+
+        with requests_mock.Mocker() as m:
+            m.get(VIMEO_INFO_URL.format(1), text=vimeo_info(1))
+            m.get(VIMEO_INFO_URL.format(2), status_code=404)
+            out = self.call(chunk_size=2)
+            self.assertEqual(m.call_count, 2)
+
+            # Data are loaded from cache now.
+            self.assertEqual(
+                VideoItem.objects.get(pk=1).video_backend.thumbnail,
+                "https://i.vimeocdn.com/x",
+            )
+            self.assertEqual(m.call_count, 2)
+
+        self.assertIn("2 videos in", out.splitlines()[0])
+        self.assertIn("1 warmed, 1 missing, 0 failed, 1 duplicates, 1 unknown", out)
+        self.assertIn("vimeo: 2", out)
+
+    def test_shards(self):
+        for code in range(1, 11):
+            VideoItem.objects.create(video="https://vimeo.com/{0}".format(code))
+
+        with requests_mock.Mocker() as m:
+            m.get(requests_mock.ANY, text=vimeo_info(1))
+            self.call(shard="1/3")
+            self.call(shard="2/3")
+            self.call(shard="3/3")
+            self.assertEqual(m.call_count, 10)
+
+    def test_provider_limit(self):
+        VideoItem.objects.create(video="https://vimeo.com/1")
+        with patch(
+            "embed_video.utils.map_concurrently", wraps=utils.map_concurrently
+        ) as map_concurrently, requests_mock.Mocker() as m:
+            m.get(requests_mock.ANY, text=vimeo_info(1))
+            self.call(workers=3, provider_limit=["vimeo=1"])
+        self.assertEqual(map_concurrently.call_args[1]["limits"], {"vimeo": 1})
+        self.assertEqual(map_concurrently.call_args[1]["max_pending"], 3)
+
+    def test_models(self):
+        VideoItem.objects.create(video="https://vimeo.com/1")
+        with requests_mock.Mocker() as m:
+            self.call("auth")
+            self.assertFalse(m.called)
+        with self.assertRaises(CommandError):
+            self.call("foo.Bar")
+
+    def test_cache_disabled(self):
+        with patch("embed_video.cache.EMBED_VIDEO_CACHE", None):
+            with self.assertRaises(CommandError):
+                self.call()
+
+
+class WarmCommandArgumentsTestCase(TestCase):
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        for value in ("0/4", "5/4", "1", "a/b"):
+            with self.assertRaises(CommandError):
+                parse_shard(value)
+
+    def test_parse_limits(self):
+        self.assertEqual(
+            parse_limits(["vimeo=2", "youtube=4"]), {"vimeo": 2, "youtube": 4}
+        )
+        for value in ("vimeo", "vimeo=0", "vimeo=x"):
+            with self.assertRaises(CommandError):
+                parse_limits([value])
+
+    def test_in_shard(self):
+        keys = ["embed_video:info:VimeoBackend:{0}".format(i) for i in range(100)]
+        shards = [[key for key in keys if in_shard(key, (i, 3))] for i in (1, 2, 3)]
+        self.assertEqual(sorted(sum(shards, [])), sorted(keys))
+        self.assertTrue(all(in_shard(key, None) for key in keys))
@@ -0,0 +1,37 @@
+import uuid
+
+from django.db import models
+
+from embed_video.fields import EmbedVideoField
+
+
+class VideoItem(models.Model):
+    video = EmbedVideoField(
+        blank=True,
+        provider_field="video_provider",
+        code_field="video_code",
+        url_field="video_url",
+        status_field="video_status",
+        checked_field="video_checked",
+    )
+    video_provider = models.CharField(max_length=50, blank=True, db_index=True)
+    video_code = models.CharField(max_length=100, null=True, db_index=True)
+    video_url = models.URLField(blank=True)
+    video_status = models.CharField(max_length=10, blank=True)
+    video_checked = models.DateTimeField(null=True)
+    trailer = EmbedVideoField(blank=True)
+
+
+class ProxyVideoItem(VideoItem):
+    class Meta:
+        proxy = True
+
+
+class ChildVideoItem(VideoItem):
+    title = models.CharField(max_length=50, blank=True)
+
+
+class UUIDVideoItem(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4)
+    video = EmbedVideoField(status_field="video_status")
+    video_status = models.CharField(max_length=10, blank=True)
@@ -4,13 +4,22 @@ from json import dumps
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
+import requests
 import requests_mock
+from django.core.cache import caches
 from django.http import HttpRequest
 from django.template import TemplateSyntaxError
 from django.template.base import Template
 from django.template.context import RequestContext
 from django.test.client import RequestFactory
-
+from django.utils import translation
+
+from embed_video import http
+from embed_video.backends import (
+    ProviderUnavailableException,
+    SoundCloudBackend,
+    YoutubeBackend,
+)
 from embed_video.templatetags.embed_video_tags import VideoNode
 
 URL_PATTERN = re.compile(r'src="?\'?([^"\'>]*)"')
@@ -134,13 +143,27 @@ class EmbedTestCase(TestCase):
         )
 
     def test_wrong_size(self):
-        template = Template("""
+        template = """
             {% load embed_video_tags %}
             {% video 'http://www.youtube.com/watch?v=jsrRJyHBvzw' 'so x huge' %}
+        """
+        self.assertRaises(TemplateSyntaxError, Template, template)
+
+    def test_wrong_size_variable(self):
+        template = Template("""
+            {% load embed_video_tags %}
+            {% video 'http://www.youtube.com/watch?v=jsrRJyHBvzw' size %}
         """)
-        request = RequestContext(HttpRequest())
+        request = RequestContext(HttpRequest(), {"size": "so x huge"})
         self.assertRaises(TemplateSyntaxError, template.render, request)
 
+    def test_private_option(self):
+        template = """
+            {% load embed_video_tags %}
+            {% video 'http://www.youtube.com/watch?v=jsrRJyHBvzw' _url='foo' %}
+        """
+        self.assertRaises(TemplateSyntaxError, Template, template)
+
     def test_tag_youtube(self):
         template = """
             {% load embed_video_tags %}
@@ -207,6 +230,7 @@ class EmbedTestCase(TestCase):
     @patch("urllib3.connectionpool.log")
     @patch("embed_video.templatetags.embed_video_tags.logger")
     def test_empty_if_timeout(self, embed_video_logger, urllib_logger):
+        http.close_session()
         template = """
             {% load embed_video_tags %}
             {% video "http://vimeo.com/72304002" as my_video %}
@@ -224,6 +248,37 @@ class EmbedTestCase(TestCase):
             "Timeout reached during rendering embed video (`http://vimeo.com/72304002`)"
         )
 
+    @patch("embed_video.templatetags.embed_video_tags.logger")
+    def test_empty_if_provider_unavailable(self, embed_video_logger):
+        template = """
+            {% load embed_video_tags %}
+            {% video "https://soundcloud.com/xyz/foo" %}
+        """
+        with patch.object(
+            SoundCloudBackend, "get_info", side_effect=ProviderUnavailableException
+        ):
+            self.assertRenderedTemplate(template, "")
+        embed_video_logger.warning.assert_called_with(
+            "Provider of embed video is unavailable "
+            "(`https://soundcloud.com/xyz/foo`)"
+        )
+
+    @patch("embed_video.templatetags.embed_video_tags.logger")
+    def test_empty_if_budget_spent(self, embed_video_logger):
+        template = """
+            {% load embed_video_tags %}
+            {% video "https://soundcloud.com/xyz/foo" %}
+            {% video "https://youtu.be/jsrRJyHBvzw" %}
+        """
+        with requests_mock.Mocker() as m, http.budget(0):
+            output = self.render_template(template)
+        self.assertFalse(m.called)
+        self.assertEqual(output.count("<iframe"), 1)
+        embed_video_logger.warning.assert_called_once_with(
+            "Time budget of requests spent before rendering embed video "
+            "(`https://soundcloud.com/xyz/foo`)"
+        )
+
     def test_relative_size(self):
         template = """
             {% load embed_video_tags %}
@@ -315,6 +370,201 @@ class EmbedTestCase(TestCase):
         )
 
 
+@patch(
+    "embed_video.templatetags.embed_video_tags.EMBED_VIDEO_FRAGMENT_CACHE", "default"
+)
+class FragmentCacheTestCase(TestCase):
+    template = """
+        {% load embed_video_tags %}
+        {% video 'http://www.youtube.com/watch?v=jsrRJyHBvzw' size %}
+    """
+
+    def setUp(self):
+        caches["default"].clear()
+
+    def render(self, request=None, **context):
+        request = request or HttpRequest()
+        context["request"] = request
+        return Template(self.template).render(RequestContext(request, context))
+
+    def test_cached(self):
+        output = self.render(size="large")
+        with patch.object(YoutubeBackend, "get_embed_code") as get_embed_code:
+            self.assertEqual(self.render(size="large"), output)
+        get_embed_code.assert_not_called()
+
+    def test_key_contains_size(self):
+        self.render(size="large")
+        self.assertIn('width="480"', self.render(size="small"))
+
+    def test_key_contains_protocol(self):
+        request = RequestFactory().get("/", secure=True)
+        self.assertIn("https://", self.render(request=request))
+        self.assertIn("http://", self.render(request=RequestFactory().get("/")))
+
+    def test_degraded_lite_code_not_cached(self):
+        self.template = """
+            {% load embed_video_tags %}
+            {% video 'http://www.youtube.com/watch?v=jsrRJyHBvzw' mode='lite' %}
+        """
+        with patch.object(
+            YoutubeBackend, "get_lite_thumbnail_url", side_effect=requests.Timeout
+        ):
+            self.assertNotIn("<img", self.render())
+        with patch.object(
+            YoutubeBackend, "get_lite_thumbnail_url", return_value="t.jpg"
+        ):
+            self.assertIn('<img src="t.jpg"', self.render())
+        with patch.object(
+            YoutubeBackend, "get_lite_thumbnail_url"
+        ) as get_lite_thumbnail_url:
+            self.assertIn('<img src="t.jpg"', self.render())
+        get_lite_thumbnail_url.assert_not_called()
+
+    def test_block_not_cached(self):
+        self.template = """
+            {% load embed_video_tags %}
+            {% video 'http://www.youtube.com/watch?v=jsrRJyHBvzw' as ytb %}
+                {{ ytb.url }}
+            {% endvideo %}
+        """
+        self.render()
+        with patch.object(YoutubeBackend, "get_url") as get_url:
+            self.render()
+        get_url.assert_called_once()
+
+    def test_key(self):
+        url = "http://www.youtube.com/watch?v=jsrRJyHBvzw"
+        key = VideoNode.get_cache_key(url, "large", query="rel=0")
+        self.assertEqual(key, VideoNode.get_cache_key(url, "large", query="rel=0"))
+        self.assertNotEqual(key, VideoNode.get_cache_key(url, "large", query="rel=1"))
+        self.assertIsNone(VideoNode.get_cache_key(YoutubeBackend(url), "large"))
+
+    def test_key_contains_language(self):
+        url = "http://www.youtube.com/watch?v=jsrRJyHBvzw"
+        with translation.override("en"):
+            key = VideoNode.get_cache_key(url, "large", mode="lite")
+        with translation.override("cs"):
+            self.assertNotEqual(key, VideoNode.get_cache_key(url, "large", mode="lite"))
+
+    def test_key_contains_lite_template(self):
+        url = "http://www.youtube.com/watch?v=jsrRJyHBvzw"
+        key = VideoNode.get_cache_key(url, "large", mode="lite")
+        with patch.object(YoutubeBackend, "lite_template_name", "foo.html"):
+            self.assertNotEqual(key, VideoNode.get_cache_key(url, "large", mode="lite"))
+
+
+class StaticArgumentsTestCase(TestCase):
+    def get_template(self, template):
+        return Template("{% load embed_video_tags %}" + template)
+
+    def get_node(self, template):
+        return self.get_template(template).nodelist[-1]
+
+    def render(self, template, **context):
+        return template.render(RequestContext(HttpRequest(), context)).strip()
+
+    def test_static_size(self):
+        node = self.get_node("{% video url '300x200' %}")
+        self.assertEqual(node.static_size, ("300", "200"))
+        self.assertEqual(self.get_node("{% video url %}").static_size, (480, 360))
+        self.assertIsNone(self.get_node("{% video url size %}").static_size)
+        self.assertIsNone(self.get_node("{% video url 'large'|lower %}").static_size)
+
+    def test_static_options(self):
+        node = self.get_node("{% video url query='rel=0' is_secure=True %}")
+        self.assertEqual(node.static_options, {"query": "rel=0", "is_secure": True})
+        node = self.get_node("{% video url query='rel=0' is_secure=secure %}")
+        self.assertIsNone(node.static_options)
+
+    def test_static_backend(self):
+        node = self.get_node("{% video 'https://youtu.be/jsrRJyHBvzw' %}")
+        self.assertIsInstance(node.static_backend, YoutubeBackend)
+        self.assertEqual(node.static_backend.code, "jsrRJyHBvzw")
+        self.assertIsNone(self.get_node("{% video url %}").static_backend)
+        self.assertIsNone(self.get_node("{% video 'http://foo.bar' %}").static_backend)
+
+    def test_static_backend_without_network(self):
+        with requests_mock.Mocker() as mocker:
+            node = self.get_node("{% video 'https://soundcloud.com/xyz/foo' %}")
+        self.assertIsNone(node.static_backend.__dict__.get("_code"))
+        self.assertFalse(mocker.called)
+
+    def test_render_static(self):
+        template = self.get_template(
+            "{% video 'https://youtu.be/jsrRJyHBvzw' 'large' query='rel=0' %}"
+        )
+        with patch.object(VideoNode, "get_size") as get_size, patch(
+            "embed_video.templatetags.embed_video_tags.detect_backend_class"
+        ) as detect_backend_class:
+            self.assertEqual(
+                self.render(template),
+                '<iframe width="960" height="720" '
+                'src="https://www.youtube.com/embed/jsrRJyHBvzw?rel=0" '
+                'loading="lazy" frameborder="0" allowfullscreen '
+                'referrerpolicy="strict-origin-when-cross-origin"></iframe>',
+            )
+        get_size.assert_not_called()
+        detect_backend_class.assert_not_called()
+
+    def test_lite_mode(self):
+        template = self.get_template(
+            "{% video 'https://youtu.be/jsrRJyHBvzw' '300x200' mode='lite' %}"
+        )
+        with patch.object(
+            YoutubeBackend, "get_lite_thumbnail_url", return_value="t.jpg"
+        ):
+            output = self.render(template)
+        self.assertIn('class="embed-video-lite"', output)
+        self.assertIn('<img src="t.jpg"', output)
+        self.assertIn("<template><iframe", output)
+
+    def test_lite_mode_translated_label(self):
+        template = self.get_template(
+            "{% video 'https://youtu.be/jsrRJyHBvzw' '300x200' mode='lite' %}"
+        )
+        with patch.object(YoutubeBackend, "get_lite_thumbnail_url", return_value=None):
+            with patch.object(translation._trans, "gettext", side_effect=str.upper):
+                output = self.render(template)
+        self.assertIn('aria-label="PLAY VIDEO"', output)
+
+    def test_given_backend_not_changed(self):
+        template = self.get_template(
+            "{% video x 'small' query='rel=0' %}|{% video x 'small' %}"
+        )
+        backend = YoutubeBackend("https://youtu.be/jsrRJyHBvzw")
+        first, second = self.render(template, x=backend).split("|")
+        self.assertIn("embed/jsrRJyHBvzw?rel=0", first)
+        self.assertIn("embed/jsrRJyHBvzw?wmode=opaque", second)
+        self.assertEqual(backend.query.urlencode(), "wmode=opaque")
+
+    def test_dynamic_mode(self):
+        template = self.get_template("{% video url mode=mode %}")
+        url = "https://youtu.be/jsrRJyHBvzw"
+        self.assertTrue(self.render(template, url=url, mode=None).startswith("<iframe"))
+        with self.assertRaises(TemplateSyntaxError):
+            self.render(template, url=url, mode="foo")
+
+    def test_unknown_mode(self):
+        with self.assertRaises(TemplateSyntaxError):
+            self.get_template("{% video url mode='foo' %}")
+
+    def test_render_static_copies_backend(self):
+        template = self.get_template(
+            "{% video 'https://youtu.be/jsrRJyHBvzw' query=query as ytb %}"
+            "{{ ytb.url }}"
+            "{% endvideo %}"
+        )
+        self.assertEqual(
+            self.render(template, query="rel=0"),
+            "https://www.youtube.com/embed/jsrRJyHBvzw?rel=0",
+        )
+        self.assertEqual(
+            self.render(template, query="rel=1"),
+            "https://www.youtube.com/embed/jsrRJyHBvzw?rel=1",
+        )
+
+
 class EmbedVideoNodeTestCase(TestCase):
     def setUp(self):
         self.parser = Mock()
@@ -363,3 +613,7 @@ class EmbedVideoNodeTestCase(TestCase):
             "http://www.youtube.com/watch?v=jsrRJyHBvzw", context
         )
         self.assertFalse(backend.is_secure)
+
+    def test_fragment_cache_disabled(self):
+        url = "http://www.youtube.com/watch?v=jsrRJyHBvzw"
+        self.assertIsNone(VideoNode.get_cache_key(url, "large"))
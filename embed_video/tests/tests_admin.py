@@ -1,9 +1,18 @@
+import copy
+from json import dumps
 from unittest import TestCase
+from unittest.mock import patch
 
+import requests_mock
 from django.test import SimpleTestCase
 
+from embed_video import http
 from embed_video.admin import AdminVideoMixin, AdminVideoWidget
-from embed_video.backends import VimeoBackend
+from embed_video.backends import (
+    ProviderUnavailableException,
+    SoundCloudBackend,
+    VimeoBackend,
+)
 from embed_video.fields import EmbedVideoField, EmbedVideoFormField
 
 
@@ -52,6 +61,92 @@ class AdminVideoWidgetTestCase(SimpleTestCase):
             '<input name="foo" size="40" type="text" value="https://soundcloud.com/xyz/foo" />',
         )
 
+    def test_render_provider_unavailable(self):
+        url = "https://soundcloud.com/xyz/foo"
+        widget = AdminVideoWidget()
+        with patch.object(
+            SoundCloudBackend, "get_info", side_effect=ProviderUnavailableException
+        ):
+            self.assertHTMLEqual(
+                widget.render("foo", url),
+                '<input name="foo" size="40" type="text" value="%s" />' % url,
+            )
+
+    def test_render_budget_spent(self):
+        url = "https://soundcloud.com/xyz/foo"
+        widget = AdminVideoWidget()
+        with requests_mock.Mocker() as m, http.budget(0):
+            self.assertHTMLEqual(
+                widget.render("foo", url),
+                '<input name="foo" size="40" type="text" value="%s" />' % url,
+            )
+        self.assertFalse(m.called)
+
+
+class AdminVideoWidgetFacadeTestCase(SimpleTestCase):
+    url = "https://vimeo.com/72304002"
+
+    def setUp(self):
+        self.mocker = requests_mock.Mocker()
+        self.mocker.start()
+        self.addCleanup(self.mocker.stop)
+        self.mocker.get(
+            "https://vimeo.com/api/v2/video/72304002.json",
+            text=dumps([{"thumbnail_large": "https://i.vimeocdn.com/x.jpg"}]),
+        )
+
+    def test_render_facade(self):
+        widget = AdminVideoWidget(attrs={"size": "0"}, facade=True)
+        widget.output_format = "{video}{input}"
+        backend = VimeoBackend(self.url)
+
+        self.assertHTMLEqual(
+            widget.render("foo", self.url, size=(100, 100)),
+            '<div class="video-facade" style="width:100px;height:100px">'
+            '<img src="https://i.vimeocdn.com/x.jpg" alt="" loading="lazy">'
+            '<button type="button" class="video-facade-play" '
+            'aria-label="Play video">&#9654;</button>'
+            "<template>%s</template></div>"
+            '<input name="foo" size="0" type="text" value="%s" />'
+            % (backend.get_embed_code(100, 100), self.url),
+        )
+
+    def test_render_facade_without_thumbnail(self):
+        self.mocker.get("https://vimeo.com/api/v2/video/72304002.json", status_code=500)
+        widget = AdminVideoWidget(facade=True)
+        output = widget.render("foo", self.url)
+        self.assertIn('class="video-facade-play"', output)
+        self.assertNotIn("<img", output)
+
+    def test_render_facade_youtube_without_requests(self):
+        widget = AdminVideoWidget(facade=True)
+        with requests_mock.Mocker() as m:
+            output = widget.render("foo", "https://youtu.be/jsrRJyHBvzw")
+            self.assertFalse(m.called)
+        self.assertIn("/vi/jsrRJyHBvzw/hqdefault.jpg", output)
+
+    def test_media(self):
+        self.assertEqual(str(AdminVideoWidget().media), "")
+        self.assertIn(
+            "embed_video/admin_facade.js", str(AdminVideoWidget(facade=True).media)
+        )
+
+    def test_reuse_validated_backend(self):
+        formfield = EmbedVideoFormField(widget=AdminVideoWidget(facade=True))
+        formfield.validate(self.url)
+        backend = formfield.widget.backends[self.url]
+        backend.thumbnail
+
+        with patch("embed_video.admin.detect_backend") as detect_backend:
+            formfield.widget.render("foo", self.url)
+        detect_backend.assert_not_called()
+        self.assertEqual(self.mocker.call_count, 1)
+
+    def test_deepcopy(self):
+        widget = AdminVideoWidget()
+        widget.backends[self.url] = VimeoBackend(self.url)
+        self.assertEqual(copy.deepcopy(widget).backends, {})
+
 
 class AdminVideoMixinTestCase(TestCase):
     def test_embedvideofield(self):
@@ -61,6 +156,16 @@ class AdminVideoMixinTestCase(TestCase):
             isinstance(mixin.formfield_for_dbfield(foo), EmbedVideoFormField)
         )
 
+    def test_facade(self):
+        class MyAdmin(AdminVideoMixin):
+            video_facade = True
+
+        formfield = MyAdmin().formfield_for_dbfield(EmbedVideoField())
+        self.assertTrue(formfield.widget.facade)
+        self.assertFalse(
+            AdminVideoMixin().formfield_for_dbfield(EmbedVideoField()).widget.facade
+        )
+
     def test_other_fields(self):
         class Parent:
             def formfield_for_dbfield(*args, **kwargs):
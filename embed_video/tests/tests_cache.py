@@ -0,0 +1,159 @@
+import time
+from json import dumps
+from unittest import TestCase
+from unittest.mock import patch
+
+import requests
+import requests_mock
+from django.core.cache import caches
+
+from embed_video import cache
+from embed_video.backends import (
+    SoundCloudBackend,
+    VideoDoesntExistException,
+    VimeoBackend,
+)
+
+VIMEO_INFO_URL = "https://vimeo.com/api/v2/video/72304002.json"
+VIMEO_INFO = dumps([{"id": 72304002, "thumbnail_large": "https://i.vimeocdn.com/x"}])
+
+
+@patch("embed_video.cache.EMBED_VIDEO_CACHE", "default")
+class MetadataCacheTestCase(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+
+    def test_info_is_fetched_once(self):
+        with requests_mock.Mocker() as m:
+            m.get(VIMEO_INFO_URL, text=VIMEO_INFO)
+            VimeoBackend("https://vimeo.com/72304002").info
+            info = VimeoBackend("https://player.vimeo.com/video/72304002").info
+            self.assertEqual(m.call_count, 1)
+        self.assertEqual(info["id"], 72304002)
+
+    def test_thumbnail_uses_cached_info(self):
+        with requests_mock.Mocker() as m:
+            m.get(VIMEO_INFO_URL, text=VIMEO_INFO)
+            VimeoBackend("https://vimeo.com/72304002").info
+            thumbnail = VimeoBackend("https://vimeo.com/72304002").thumbnail
+            self.assertEqual(m.call_count, 1)
+        self.assertEqual(thumbnail, "https://i.vimeocdn.com/x")
+
+    def test_negative_entry(self):
+        url = "https://soundcloud.com/xyz/foo"
+        with requests_mock.Mocker() as m:
+            m.get("https://soundcloud.com/oembed", status_code=404)
+            for i in range(2):
+                with self.assertRaises(VideoDoesntExistException):
+                    SoundCloudBackend(url).info
+            self.assertEqual(m.call_count, 1)
+
+    def test_provider_error_not_cached(self):
+        for backend, info_url, info in (
+            (
+                SoundCloudBackend("https://soundcloud.com/xyz/foo"),
+                "https://soundcloud.com/oembed",
+                dumps({"html": ""}),
+            ),
+            (VimeoBackend("https://vimeo.com/72304002"), VIMEO_INFO_URL, VIMEO_INFO),
+        ):
+            with requests_mock.Mocker() as m:
+                m.get(info_url, status_code=503, text="<html>Unavailable</html>")
+                with self.assertRaises(requests.HTTPError):
+                    backend.info
+                m.get(info_url, text=info)
+                self.assertTrue(type(backend)(backend._url).info)
+                self.assertEqual(m.call_count, 2)
+
+    def test_backend_timeouts(self):
+        class FooBackend(VimeoBackend):
+            cache_timeout = 42
+            negative_cache_timeout = 7
+
+            def get_info(self):
+                if self.code == "1":
+                    return {}
+                raise VideoDoesntExistException
+
+        with patch.object(caches["default"], "set") as cache_set:
+            FooBackend("https://vimeo.com/1").info
+            with self.assertRaises(VideoDoesntExistException):
+                FooBackend("https://vimeo.com/2").info
+
+        self.assertEqual(cache_set.call_args_list[0][0][2], 42)
+        self.assertEqual(cache_set.call_args_list[1][0][2], 7)
+
+    def test_peek(self):
+        key = cache.make_key("info", "VimeoBackend", "72304002")
+        self.assertEqual(cache.peek(key, "foo"), "foo")
+        cache.get_or_fetch(key, lambda: "bar")
+        self.assertEqual(cache.peek(key), "bar")
+        with patch("embed_video.cache.EMBED_VIDEO_CACHE", None):
+            self.assertIsNone(cache.peek(key))
+
+    def test_make_key(self):
+        key = cache.make_key("info", "VimeoBackend", "x" * 1000)
+        self.assertTrue(key.startswith("embed_video:info:VimeoBackend:"))
+        self.assertLess(len(key), 250)
+
+
+def run_now(fn, *args, **kwargs):
+    fn(*args, **kwargs)
+
+
+@patch("embed_video.cache.EMBED_VIDEO_CACHE", "default")
+class StaleWhileRevalidateTestCase(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+
+    def get(self, fetch, **kwargs):
+        return cache.get_or_fetch("key", fetch, timeout=10, stale_timeout=60, **kwargs)
+
+    def test_fresh_value(self):
+        self.get(lambda: 1)
+        self.assertEqual(self.get(lambda: 2), 1)
+
+    @patch("embed_video.cache.utils.submit", side_effect=run_now)
+    def test_stale_value_is_refreshed(self, submit):
+        self.get(lambda: 1)
+        with patch("embed_video.cache.time.time", return_value=time.time() + 20):
+            self.assertEqual(self.get(lambda: 2), 1)
+        submit.assert_called_once()
+        self.assertEqual(self.get(lambda: 3), 2)
+
+    @patch("embed_video.cache.utils.submit")
+    def test_single_refresh(self, submit):
+        self.get(lambda: 1)
+        with patch("embed_video.cache.time.time", return_value=time.time() + 20):
+            self.get(lambda: 2)
+            self.get(lambda: 2)
+        submit.assert_called_once()
+
+    @patch("embed_video.cache.utils.submit", side_effect=run_now)
+    def test_failed_refresh_keeps_stale_value(self, submit):
+        def fail():
+            raise requests.ConnectionError
+
+        self.get(lambda: 1)
+        with patch("embed_video.cache.time.time", return_value=time.time() + 20):
+            with self.assertLogs("embed_video.cache", "WARNING"):
+                self.assertEqual(self.get(fail), 1)
+            self.assertEqual(self.get(fail), 1)
+        self.assertEqual(submit.call_count, 2)
+
+    def test_hard_timeout(self):
+        with patch.object(caches["default"], "set") as cache_set:
+            self.get(lambda: 1)
+        self.assertEqual(cache_set.call_args[0][2], 70)
+
+
+class DisabledMetadataCacheTestCase(TestCase):
+    def test_get_cache(self):
+        self.assertIsNone(cache.get_cache())
+
+    def test_info_is_fetched_each_time(self):
+        with requests_mock.Mocker() as m:
+            m.get(VIMEO_INFO_URL, text=VIMEO_INFO)
+            VimeoBackend("https://vimeo.com/72304002").info
+            VimeoBackend("https://vimeo.com/72304002").info
+            self.assertEqual(m.call_count, 2)
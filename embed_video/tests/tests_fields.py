@@ -1,14 +1,29 @@
+import time
+from types import SimpleNamespace
 from unittest import TestCase
 from unittest.mock import patch
 
+import requests
+import requests_mock
+from django.core.exceptions import FieldError
+from django.db.models.query_utils import DeferredAttribute
 from django.forms import ValidationError
+from django.test import TestCase as DatabaseTestCase
 
 from embed_video.backends import (
     UnknownBackendException,
     UnknownIdException,
+    VimeoBackend,
     YoutubeBackend,
 )
-from embed_video.fields import EmbedVideoField, EmbedVideoFormField
+from embed_video.fields import (
+    EmbedVideoField,
+    EmbedVideoFormField,
+    backfill_video_fields,
+    prefetch_videos,
+)
+from embed_video.settings import EMBED_VIDEO_TIMEOUT
+from embed_video.tests.models import ChildVideoItem, ProxyVideoItem, VideoItem
 
 
 class EmbedVideoFieldTestCase(TestCase):
@@ -18,6 +33,216 @@ class EmbedVideoFieldTestCase(TestCase):
     def test_formfield_form_class(self):
         self.assertIsInstance(self.field.formfield(), EmbedVideoFormField)
 
+    def test_deconstruct(self):
+        self.assertNotIn("provider_field", self.field.deconstruct()[3])
+        field = EmbedVideoField(provider_field="provider", code_field="code")
+        kwargs = field.deconstruct()[3]
+        self.assertEqual(kwargs["provider_field"], "provider")
+        self.assertEqual(kwargs["code_field"], "code")
+        self.assertNotIn("url_field", kwargs)
+
+    def test_video_values(self):
+        field = VideoItem._meta.get_field("video")
+        self.assertEqual(
+            field.get_video_values("https://vimeo.com/72304002"),
+            {
+                "provider": "vimeo",
+                "code": "72304002",
+                "url": "https://player.vimeo.com/video/72304002",
+            },
+        )
+        self.assertEqual(
+            field.get_video_values("http://example.com/foo"),
+            {"provider": None, "code": None, "url": None},
+        )
+
+
+class VideoBackendDescriptorTestCase(TestCase):
+    url = "https://www.youtube.com/watch?v=jsrRJyHBvzw"
+
+    def test_backend(self):
+        item = VideoItem(video=self.url)
+        self.assertIsInstance(item.video_backend, YoutubeBackend)
+        self.assertEqual(item.video_backend.code, "jsrRJyHBvzw")
+        self.assertIsNone(item.trailer_backend)
+        self.assertIsNone(VideoItem(video="http://example.com/foo").video_backend)
+
+    def test_detected_once(self):
+        item = VideoItem(video=self.url)
+        with patch(
+            "embed_video.fields.detect_backend", return_value=YoutubeBackend(self.url)
+        ) as detect:
+            self.assertIs(item.video_backend, item.video_backend)
+        detect.assert_called_once()
+
+    def test_reset_on_assignment(self):
+        item = VideoItem(video=self.url)
+        item.video_backend
+        item.video = "https://vimeo.com/72304002"
+        self.assertIsInstance(item.video_backend, VimeoBackend)
+        item.video = ""
+        self.assertIsNone(item.video_backend)
+
+    def test_prefetched(self):
+        item = VideoItem(video=self.url)
+        with requests_mock.Mocker():
+            prefetch_videos([item], "video")
+        with patch("embed_video.fields.detect_backend") as detect:
+            backend = item.video_backend
+            self.assertIsInstance(backend, YoutubeBackend)
+            self.assertIs(item.video_backend, backend)
+        detect.assert_not_called()
+
+    def test_plain_field_descriptor(self):
+        self.assertIs(type(VideoItem.video), DeferredAttribute)
+
+
+class VideoFieldsTestCase(DatabaseTestCase):
+    url = "https://www.youtube.com/watch?v=jsrRJyHBvzw"
+
+    def test_filled_in_on_save(self):
+        item = VideoItem.objects.create(video=self.url)
+        item.refresh_from_db()
+        self.assertEqual(item.video_provider, "youtube")
+        self.assertEqual(item.video_code, "jsrRJyHBvzw")
+        self.assertEqual(
+            item.video_url, "https://www.youtube.com/embed/jsrRJyHBvzw?wmode=opaque"
+        )
+
+        item.video = ""
+        item.save()
+        item.refresh_from_db()
+        self.assertEqual(item.video_provider, "")
+        self.assertIsNone(item.video_code)
+
+    def test_unavailable_code(self):
+        with requests_mock.Mocker() as mocker:
+            mocker.get(requests_mock.ANY, status_code=500)
+            item = VideoItem.objects.create(video="https://soundcloud.com/xyz/foo")
+        self.assertEqual(item.video_provider, "soundcloud")
+        self.assertIsNone(item.video_code)
+
+    def test_filled_in_for_proxy_and_child(self):
+        for model in (ProxyVideoItem, ChildVideoItem):
+            model.objects.create(video=self.url)
+            self.assertEqual(
+                list(
+                    model.objects.filter(video__code="jsrRJyHBvzw").values_list(
+                        "video_provider", flat=True
+                    )
+                ),
+                ["youtube"],
+            )
+            model.objects.all().delete()
+
+    def test_unchanged_url_not_detected_on_save(self):
+        for model in (ProxyVideoItem, ChildVideoItem):
+            model.objects.create(video=self.url)
+            item = model.objects.get()
+            with patch("embed_video.fields.detect_backend") as detect:
+                item.save()
+            detect.assert_not_called()
+            model.objects.all().delete()
+
+        VideoItem.objects.create(video=self.url)
+        item = VideoItem.objects.get()
+        with patch("embed_video.fields.detect_backend") as detect:
+            item.save()
+        detect.assert_not_called()
+
+        item.video = "https://vimeo.com/72304002"
+        item.save()
+        item = VideoItem.objects.get()
+        self.assertEqual(item.video_code, "72304002")
+
+    def test_save_without_companion_update_fields(self):
+        item = VideoItem.objects.create(video=self.url)
+        item.video = "https://vimeo.com/72304002"
+        item.save(update_fields=["video"])
+        item.save()
+        item = VideoItem.objects.get()
+        self.assertEqual(item.video_provider, "vimeo")
+
+        item.video = self.url
+        item.save(update_fields=["video"])
+        item = VideoItem.objects.get()
+        item.save()
+        self.assertEqual(VideoItem.objects.get().video_provider, "youtube")
+
+    def test_save_with_pk_fills_in(self):
+        item = VideoItem.objects.create(video="")
+        VideoItem(pk=item.pk, video=self.url).save()
+        self.assertEqual(VideoItem.objects.get().video_code, "jsrRJyHBvzw")
+
+    def test_check_companion_fields(self):
+        self.assertEqual(VideoItem._meta.get_field("video").check(), [])
+        field = EmbedVideoField(code_field="foo")
+        field.model = VideoItem
+        field.name = "bar"
+        self.assertEqual(
+            [error.id for error in field._check_video_fields()], ["embed_video.E001"]
+        )
+        field.code_field = "video_provider"
+        field.creation_counter = (
+            VideoItem._meta.get_field("video_provider").creation_counter + 1
+        )
+        self.assertEqual(
+            [error.id for error in field._check_video_fields()], ["embed_video.E002"]
+        )
+
+    def test_backend_reset_on_refresh(self):
+        item = VideoItem.objects.create(video=self.url)
+        item.video_backend
+        VideoItem.objects.filter(pk=item.pk).update(video="https://vimeo.com/1")
+        item.refresh_from_db()
+        self.assertIsInstance(item.video_backend, VimeoBackend)
+
+    def test_lookups(self):
+        item = VideoItem.objects.create(video=self.url)
+        VideoItem.objects.create(video="https://vimeo.com/72304002")
+
+        self.assertEqual(
+            list(VideoItem.objects.filter(video__provider="youtube")), [item]
+        )
+        self.assertEqual(
+            list(VideoItem.objects.filter(video__code__in=["jsrRJyHBvzw", "x"])), [item]
+        )
+        self.assertEqual(
+            VideoItem.objects.filter(
+                video__url__startswith="https://player.vimeo.com/"
+            ).count(),
+            1,
+        )
+
+    def test_lookup_uses_column(self):
+        query = str(VideoItem.objects.filter(video__code="jsrRJyHBvzw").query)
+        self.assertIn('"video_code" = jsrRJyHBvzw', query)
+
+    def test_lookup_without_companion_field(self):
+        with self.assertRaises(FieldError):
+            VideoItem.objects.filter(trailer__code="jsrRJyHBvzw")
+
+    def test_backfill(self):
+        VideoItem.objects.bulk_create(
+            [VideoItem(video=self.url), VideoItem(video="https://vimeo.com/1")]
+            + [VideoItem(video="") for i in range(3)]
+        )
+        # Rows created before companion fields were added.
+        VideoItem.objects.update(video_provider="", video_code=None, video_url="")
+        self.assertEqual(VideoItem.objects.filter(video__provider="youtube").count(), 0)
+
+        self.assertEqual(
+            backfill_video_fields(VideoItem.objects.all(), "video", batch_size=2), 5
+        )
+        self.assertEqual(VideoItem.objects.filter(video__provider="youtube").count(), 1)
+        self.assertEqual(
+            VideoItem.objects.get(video__code="1").video, "https://vimeo.com/1"
+        )
+
+    def test_backfill_without_companion_fields(self):
+        with self.assertRaises(FieldError):
+            backfill_video_fields(VideoItem.objects.all(), "trailer")
+
 
 class EmbedVideoFormFieldTestCase(TestCase):
     def setUp(self):
@@ -55,3 +280,119 @@ class EmbedVideoFormFieldTestCase(TestCase):
     def test_validation_allowed_empty(self):
         formfield = EmbedVideoFormField(required=False)
         self.assertIsNone(formfield.validate(""))
+
+    def test_validation_syntax(self):
+        formfield = EmbedVideoFormField(validation="syntax")
+        with requests_mock.Mocker() as m:
+            formfield.validate("https://soundcloud.com/xyz/foo")
+            self.assertFalse(m.called)
+        self.assertRaises(
+            ValidationError, formfield.validate, "http://www.youtube.com/edit?abcd=abcd"
+        )
+
+    def test_validation_cached(self):
+        formfield = EmbedVideoFormField(validation="cached")
+        with requests_mock.Mocker() as m:
+            m.get("https://soundcloud.com/oembed", status_code=404)
+            self.assertRaises(
+                ValidationError, formfield.validate, "https://soundcloud.com/xyz/foo"
+            )
+
+    def test_validation_cached_unavailable(self):
+        formfield = EmbedVideoFormField(validation="cached")
+        with requests_mock.Mocker() as m:
+            m.get("https://soundcloud.com/oembed", exc=requests.ConnectTimeout)
+            with self.assertRaisesRegex(ValidationError, "try again"):
+                formfield.clean("https://soundcloud.com/xyz/foo")
+
+    @patch("embed_video.fields.EMBED_VIDEO_VALIDATION_TIMEOUT", 2)
+    def test_validation_budget(self):
+        with requests_mock.Mocker() as m:
+            m.get("https://soundcloud.com/oembed", status_code=404)
+            for validation in ("cached", "strict"):
+                with self.assertRaises(ValidationError):
+                    EmbedVideoFormField(validation=validation).validate(
+                        "https://soundcloud.com/xyz/foo"
+                    )
+                if validation == "strict":
+                    self.assertLessEqual(m.last_request.timeout, 2)
+                else:
+                    self.assertEqual(m.last_request.timeout, EMBED_VIDEO_TIMEOUT)
+
+    def test_validation_strict(self):
+        formfield = EmbedVideoFormField(validation="strict")
+        with requests_mock.Mocker() as m:
+            m.get("https://vimeo.com/api/v2/video/1.json", text="[{}]")
+            m.get("https://vimeo.com/api/v2/video/2.json", status_code=404)
+            m.get("https://vimeo.com/api/v2/video/3.json", status_code=503)
+            self.assertEqual(
+                formfield.validate("https://vimeo.com/1"), "https://vimeo.com/1"
+            )
+            with self.assertRaisesRegex(ValidationError, "not found"):
+                formfield.validate("https://vimeo.com/2")
+            with self.assertRaisesRegex(ValidationError, "try again"):
+                formfield.validate("https://vimeo.com/3")
+
+    @patch("embed_video.fields.EMBED_VIDEO_VALIDATION_TIMEOUT", 0.01)
+    def test_validation_strict_timeout(self):
+        formfield = EmbedVideoFormField(validation="strict")
+        with patch.object(VimeoBackend, "exists", side_effect=lambda: time.sleep(0.1)):
+            with self.assertRaisesRegex(ValidationError, "try again"):
+                formfield.validate("https://vimeo.com/1")
+
+    def test_validation_default(self):
+        self.assertEqual(EmbedVideoFormField().validation, "cached")
+        with patch("embed_video.fields.EMBED_VIDEO_VALIDATION", "syntax"):
+            self.assertEqual(EmbedVideoFormField().validation, "syntax")
+        with self.assertRaises(ValueError):
+            EmbedVideoFormField(validation="foo")
+
+
+class PrefetchVideosTestCase(TestCase):
+    info_url = "https://vimeo.com/api/v2/video/{0}.json"
+
+    def test_attach_backends(self):
+        objects = [
+            SimpleNamespace(video="http://youtu.be/jsrRJyHBvzw"),
+            SimpleNamespace(video=""),
+            SimpleNamespace(video="http://example.com/foo"),
+        ]
+        self.assertEqual(prefetch_videos(objects, "video"), objects)
+        self.assertIsInstance(objects[0].video_backend, YoutubeBackend)
+        self.assertIsNone(objects[1].video_backend)
+        self.assertIsNone(objects[2].video_backend)
+
+    def test_fetch_info(self):
+        objects = [
+            SimpleNamespace(video="https://vimeo.com/1"),
+            SimpleNamespace(video="https://vimeo.com/2"),
+            SimpleNamespace(video="https://vimeo.com/1"),
+        ]
+        with requests_mock.Mocker() as m:
+            for code in ("1", "2"):
+                m.get(self.info_url.format(code), text='[{"id": %s}]' % code)
+            prefetch_videos(objects, "video")
+            self.assertEqual(m.call_count, 2)
+
+            self.assertIsInstance(objects[0].video_backend, VimeoBackend)
+            self.assertEqual(objects[0].video_backend.info, {"id": 1})
+            self.assertEqual(objects[1].video_backend.info, {"id": 2})
+            self.assertEqual(objects[2].video_backend.info, {"id": 1})
+            self.assertIsNot(objects[0].video_backend, objects[2].video_backend)
+            self.assertEqual(m.call_count, 2)
+
+    def test_fetch_thumbnails(self):
+        objects = [SimpleNamespace(video="http://youtu.be/jsrRJyHBvzw")]
+        with requests_mock.Mocker() as m:
+            m.head(requests_mock.ANY, status_code=200)
+            prefetch_videos(objects, "video", thumbnails=True)
+            self.assertEqual(m.call_count, 1)
+            self.assertIn("maxresdefault.jpg", objects[0].video_backend.thumbnail)
+            self.assertEqual(m.call_count, 1)
+
+    def test_failed_fetch(self):
+        objects = [SimpleNamespace(video="https://vimeo.com/1")]
+        with requests_mock.Mocker() as m:
+            m.get(self.info_url.format("1"), status_code=404, text="not found")
+            prefetch_videos(objects, "video")
+        self.assertIsInstance(objects[0].video_backend, VimeoBackend)
@@ -0,0 +1,77 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.template import Context, Template
+from django.test.client import RequestFactory
+
+from embed_video.backends import VideoBackend, VimeoBackend, YoutubeBackend
+from embed_video.hints import ResourceHintsMiddleware, get_recorded_origins
+
+
+class CustomBackend(VideoBackend):
+    pattern_url = "{protocol}://player.example.com/{code}"
+
+
+class PreconnectOriginsTestCase(TestCase):
+    def test_origins(self):
+        self.assertEqual(
+            YoutubeBackend.get_preconnect_origins(),
+            ("https://www.youtube.com", "https://img.youtube.com"),
+        )
+        self.assertEqual(
+            CustomBackend.get_preconnect_origins(), ("https://player.example.com",)
+        )
+        self.assertEqual(VideoBackend.get_preconnect_origins(), ())
+
+
+class ResourceHintsMiddlewareTestCase(TestCase):
+    template = Template(
+        "{% load embed_video_tags %}<html><head></head><body>"
+        "{% for url in urls %}{% video url %}{% endfor %}</body></html>"
+    )
+
+    def get_response(self, urls, response_class=HttpResponse):
+        def view(request):
+            self.assertEqual(get_recorded_origins(), [])
+            return response_class(self.template.render(Context({"urls": urls})))
+
+        return ResourceHintsMiddleware(view)(RequestFactory().get("/"))
+
+    def test_hints(self):
+        response = self.get_response(
+            [
+                "https://youtu.be/jsrRJyHBvzw",
+                "https://vimeo.com/72304002",
+                "https://www.youtube.com/watch?v=jsrRJyHBvzw",
+            ]
+        )
+        head = response.content.decode().split("</head>")[0]
+        self.assertEqual(head.count('rel="preconnect"'), 4)
+        self.assertEqual(head.count('rel="dns-prefetch"'), 4)
+        self.assertEqual(head.count('href="https://www.youtube.com"'), 2)
+        self.assertIn('<link rel="preconnect" href="https://player.vimeo.com">', head)
+        self.assertFalse(response.has_header("Link"))
+
+    def test_without_videos(self):
+        response = self.get_response([])
+        self.assertNotIn(b"<link", response.content)
+
+    def test_outside_middleware(self):
+        self.template.render(Context({"urls": ["https://vimeo.com/72304002"]}))
+        self.assertEqual(get_recorded_origins(), [])
+
+    @patch("embed_video.hints.EMBED_VIDEO_HINTS_HEADER", True)
+    def test_link_header(self):
+        response = self.get_response(["https://vimeo.com/72304002"])
+        self.assertEqual(
+            response["Link"],
+            "<https://player.vimeo.com>; rel=preconnect, "
+            "<https://i.vimeocdn.com>; rel=preconnect",
+        )
+
+    def test_streaming_response(self):
+        response = self.get_response(
+            ["https://vimeo.com/72304002"], StreamingHttpResponse
+        )
+        self.assertNotIn(b"<link", b"".join(response.streaming_content))
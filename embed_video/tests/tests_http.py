@@ -0,0 +1,99 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import requests
+import requests_mock
+
+from embed_video import http
+
+
+class HttpTestCase(TestCase):
+    def setUp(self):
+        http.close_session()
+
+    def test_shared_session(self):
+        self.assertIs(http.get_session(), http.get_session())
+
+    def test_close_session(self):
+        session = http.get_session()
+        http.close_session()
+        self.assertIsNot(http.get_session(), session)
+
+    def test_reset_session(self):
+        session = http.get_session()
+        http._reset_session()
+        self.assertIsNot(http.get_session(), session)
+
+    @patch("embed_video.http.EMBED_VIDEO_HTTP_POOL_SIZE", 3)
+    def test_pool_size(self):
+        adapter = http.create_session().get_adapter("https://vimeo.com/")
+        self.assertEqual(adapter._pool_maxsize, 3)
+
+    @patch("embed_video.http.EMBED_VIDEO_USER_AGENT", "my-agent")
+    def test_user_agent(self):
+        with requests_mock.Mocker() as m:
+            m.get("https://vimeo.com/", text="")
+            http.get("https://vimeo.com/")
+        self.assertEqual(m.last_request.headers["User-Agent"], "my-agent")
+
+    @patch("embed_video.http.EMBED_VIDEO_TIMEOUT", (1, 5))
+    def test_default_timeout(self):
+        with requests_mock.Mocker() as m:
+            m.head("https://vimeo.com/", text="")
+            http.head("https://vimeo.com/")
+            http.head("https://vimeo.com/", timeout=2)
+        self.assertEqual(m.request_history[0].timeout, (1, 5))
+        self.assertEqual(m.request_history[1].timeout, 2)
+
+    def test_cookies_are_not_stored(self):
+        with requests_mock.Mocker() as m:
+            m.get("https://vimeo.com/", text="", cookies={"foo": "bar"})
+            http.get("https://vimeo.com/")
+        self.assertEqual(len(http.get_session().cookies), 0)
+
+
+class BudgetTestCase(TestCase):
+    url = "https://vimeo.com/api/v2/video/72304002.json"
+
+    def test_without_budget(self):
+        self.assertIsNone(http.get_remaining_budget())
+        with requests_mock.Mocker() as m:
+            m.get(self.url)
+            http.get(self.url, timeout=(3, 10))
+            self.assertEqual(m.last_request.timeout, (3, 10))
+
+    def test_timeout_is_capped(self):
+        with requests_mock.Mocker() as m, http.budget(2):
+            m.get(self.url)
+            http.get(self.url, timeout=(1, 10))
+            connect, read = m.last_request.timeout
+        self.assertEqual(connect, 1)
+        self.assertLessEqual(read, 2)
+
+    def test_spent_budget(self):
+        with requests_mock.Mocker() as m, http.budget(0):
+            with self.assertRaises(http.BudgetExceededException):
+                http.get(self.url)
+            self.assertFalse(m.called)
+
+    def test_capped_timeout_reached(self):
+        with requests_mock.Mocker() as m, http.budget(1):
+            m.get(self.url, exc=requests.ReadTimeout)
+            with self.assertRaises(http.BudgetExceededException):
+                http.get(self.url, timeout=10)
+
+    def test_nested_budget(self):
+        with http.budget(1):
+            with http.budget(10):
+                self.assertLessEqual(http.get_remaining_budget(), 1)
+            with http.budget(None):
+                self.assertIsNone(http.get_remaining_budget())
+        self.assertIsNone(http.get_remaining_budget())
+
+    def test_middleware(self):
+        middleware = http.RequestBudgetMiddleware(
+            lambda request: http.get_remaining_budget()
+        )
+        with patch("embed_video.http.EMBED_VIDEO_REQUEST_BUDGET", 5):
+            self.assertLessEqual(middleware(None), 5)
+        self.assertIsNone(http.get_remaining_budget())
@@ -0,0 +1,126 @@
+import collections
+import contextvars
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from embed_video import utils
+
+var = contextvars.ContextVar("var", default=None)
+
+
+class ExecutorTestCase(TestCase):
+    def test_shared_executor(self):
+        self.assertIs(utils.get_executor(), utils.get_executor())
+
+    def test_reset_executor(self):
+        executor = utils.get_executor()
+        utils._reset_executor()
+        self.assertIsNot(utils.get_executor(), executor)
+
+    def test_submit_copies_context(self):
+        token = var.set("foo")
+        try:
+            self.assertEqual(utils.submit(var.get).result(), "foo")
+        finally:
+            var.reset(token)
+
+    def test_in_worker(self):
+        self.assertFalse(utils.in_worker())
+        self.assertTrue(utils.submit(utils.in_worker).result())
+
+
+class MapConcurrentlyTestCase(TestCase):
+    def test_results(self):
+        results = {
+            item: future.result()
+            for item, future in utils.map_concurrently(lambda x: x * 2, range(50))
+        }
+        self.assertEqual(results, {i: i * 2 for i in range(50)})
+
+    def test_limits(self):
+        lock = threading.Lock()
+        running = collections.Counter()
+        maximum = collections.Counter()
+
+        def fn(item):
+            with lock:
+                running[item % 2] += 1
+                maximum[item % 2] = max(maximum[item % 2], running[item % 2])
+            time.sleep(0.001)
+            with lock:
+                running[item % 2] -= 1
+
+        list(
+            utils.map_concurrently(
+                fn, range(40), max_pending=4, group=lambda i: i % 2, limits={1: 1}
+            )
+        )
+        self.assertEqual(maximum[1], 1)
+        self.assertLessEqual(maximum[0], 4)
+
+    def test_more_than_shared_pool(self):
+        barrier = threading.Barrier(12, timeout=5)
+
+        def fn(item):
+            # Fails unless all calls run at once.
+            barrier.wait()
+            return utils.in_worker()
+
+        with patch("embed_video.utils.EMBED_VIDEO_MAX_WORKERS", 2):
+            utils._reset_executor()
+            results = [
+                future.result()
+                for item, future in utils.map_concurrently(
+                    fn, range(12), max_pending=12
+                )
+            ]
+        utils._reset_executor()
+        self.assertEqual(results, [True] * 12)
+
+    def test_invalid_limit(self):
+        with self.assertRaises(ValueError):
+            list(utils.map_concurrently(str, [1], limits={None: 0}))
+
+
+class RateLimiterTestCase(TestCase):
+    def test_wait(self):
+        limiter = utils.RateLimiter(100)
+        start = time.monotonic()
+        for i in range(6):
+            limiter.wait()
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            utils.RateLimiter(0)
+
+
+class CircuitBreakerTestCase(TestCase):
+    def test_opens_after_failures(self):
+        breaker = utils.CircuitBreaker(0.5, window=4, cooldown=60)
+        for success in (True, False, True):
+            self.assertTrue(breaker.allow())
+            breaker.record(success)
+        self.assertEqual(breaker.state, breaker.CLOSED)
+        breaker.record(False)
+        self.assertEqual(breaker.state, breaker.OPEN)
+        self.assertFalse(breaker.allow())
+
+    def test_half_open(self):
+        breaker = utils.CircuitBreaker(1, window=1, cooldown=0)
+        breaker.record(False)
+        self.assertEqual(breaker.state, breaker.HALF_OPEN)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record(False)
+        self.assertTrue(breaker.allow())
+        breaker.record(True)
+        self.assertEqual(breaker.state, breaker.CLOSED)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            utils.CircuitBreaker(0)
+        with self.assertRaises(ValueError):
+            utils.CircuitBreaker(0.5, window=0)
@@ -0,0 +1,267 @@
+import collections
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from embed_video.settings import EMBED_VIDEO_MAX_WORKERS
+
+_executor = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+def _reset_executor():
+    global _executor, _executor_lock
+    # Threads of the pool don't survive fork, the child creates its own pool.
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_executor)
+
+
+def get_executor():
+    """
+    Returns thread pool shared by all network calls running in background.
+    Its size is limited by :setting:`EMBED_VIDEO_MAX_WORKERS`.
+
+    :rtype: concurrent.futures.ThreadPoolExecutor
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=EMBED_VIDEO_MAX_WORKERS, thread_name_prefix="embed_video"
+            )
+        return _executor
+
+
+def _run_in_worker(fn, *args, **kwargs):
+    _local.in_worker = True
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _local.in_worker = False
+
+
+def submit(fn, *args, **kwargs):
+    """
+    Schedules ``fn(*args, **kwargs)`` in the shared thread pool. The function
+    runs in a copy of current :py:mod:`contextvars` context.
+
+    :rtype: concurrent.futures.Future
+    """
+    return _submit(get_executor(), fn, *args, **kwargs)
+
+
+def _submit(executor, fn, *args, **kwargs):
+    context = contextvars.copy_context()
+    return executor.submit(context.run, _run_in_worker, fn, *args, **kwargs)
+
+
+def in_worker():
+    """
+    Returns ``True`` if called from a function scheduled by :py:func:`submit`.
+    Such functions shouldn't wait for other tasks in the (bounded) pool.
+
+    :rtype: bool
+    """
+    return getattr(_local, "in_worker", False)
+
+
+def map_concurrently(fn, items, max_pending=None, group=None, limits=None):
+    """
+    Runs ``fn(item)`` for each of ``items`` in own thread pool and yields
+    ``(item, future)`` pairs as the calls complete. Items are read lazily,
+    so they can be streamed from database. Calls run in copy of current
+    :py:mod:`contextvars` context, like by :py:func:`submit`.
+
+    At most ``max_pending`` calls (default :setting:`EMBED_VIDEO_MAX_WORKERS`)
+    run at once, regardless of size of the shared pool. Items can be divided
+    into groups by ``group(item)``, and ``limits`` maps groups to their own
+    maximum of concurrent calls.
+
+    :type fn: callable
+    :type items: collections.abc.Iterable
+    :type max_pending: int | None
+    :type group: callable | None
+    :type limits: dict | None
+    :rtype: collections.abc.Iterator[tuple]
+    """
+    max_pending = max_pending or EMBED_VIDEO_MAX_WORKERS
+    limits = limits or {}
+    if min([max_pending] + list(limits.values())) < 1:
+        raise ValueError("Limits of concurrent calls must be positive.")
+
+    executor = ThreadPoolExecutor(
+        max_workers=max_pending, thread_name_prefix="embed_video_map"
+    )
+    futures = {}
+    try:
+        yield from _map_concurrently(
+            executor, futures, fn, items, max_pending, group, limits
+        )
+    finally:
+        # Calls which haven't started yet aren't needed if iteration stopped.
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _map_concurrently(executor, futures, fn, items, max_pending, group, limits):
+    items = iter(items)
+    queues = collections.OrderedDict()
+    queued = 0
+    running = collections.Counter()
+    exhausted = False
+
+    while True:
+        # Keep limited number of items in memory.
+        while not exhausted and queued < max_pending * 4:
+            try:
+                item = next(items)
+            except StopIteration:
+                exhausted = True
+                break
+            key = group(item) if group else None
+            queues.setdefault(key, collections.deque()).append(item)
+            queued += 1
+
+        for key, queue in queues.items():
+            limit = limits.get(key, max_pending)
+            while queue and len(futures) < max_pending and running[key] < limit:
+                item = queue.popleft()
+                queued -= 1
+                futures[_submit(executor, fn, item)] = (key, item)
+                running[key] += 1
+
+        if not futures:
+            return
+
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            key, item = futures.pop(future)
+            running[key] -= 1
+            yield item, future
+
+
+class RateLimiter:
+    """
+    Limits rate of calls shared by threads. Each call of :py:meth:`wait`
+    blocks until ``1 / rate`` seconds passed since the previous one.
+    """
+
+    def __init__(self, rate):
+        """
+        :param rate: Maximum number of calls per second.
+        :type rate: float
+        """
+        if rate <= 0:
+            raise ValueError("Rate has to be positive.")
+        self.interval = 1.0 / rate
+        self.lock = threading.Lock()
+        self.next_call = time.monotonic()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            scheduled = max(self.next_call, now)
+            self.next_call = scheduled + self.interval
+        if scheduled > now:
+            time.sleep(scheduled - now)
+
+
+class CircuitBreaker:
+    """
+    Stops calls to failing service. The circuit opens when ``failure_rate``
+    of the last ``window`` calls failed, and :py:meth:`allow` refuses calls
+    for ``cooldown`` seconds. Then a single trial call is allowed (half-open
+    state): the circuit closes if it succeeds, otherwise it opens again.
+
+    Results of calls are passed to :py:meth:`record`.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_rate, window=10, cooldown=30):
+        """
+        :type failure_rate: float
+        :param window: Number of last calls the failure rate is computed of.
+        :type window: int
+        :param cooldown: Number of seconds calls are refused for.
+        :type cooldown: float
+        """
+        if not 0 < failure_rate <= 1:
+            raise ValueError("Failure rate has to be in (0, 1].")
+        if window < 1:
+            raise ValueError("Window has to be positive.")
+        self.failure_rate = failure_rate
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.results = collections.deque(maxlen=window)
+        self.opened_at = None
+        self.trial = False
+
+    @property
+    def state(self):
+        """
+        :rtype: str
+        """
+        with self.lock:
+            if self.opened_at is None:
+                return self.CLOSED
+            if not self.trial and time.monotonic() - self.opened_at < self.cooldown:
+                return self.OPEN
+            return self.HALF_OPEN
+
+    def allow(self):
+        """
+        Returns ``True`` if call can be made. In half-open state only the
+        first caller gets ``True``.
+
+        :rtype: bool
+        """
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.trial or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.trial = True
+            return True
+
+    def cancel(self):
+        """
+        Releases allowed call which ended without result, so the next call
+        can be the trial one.
+        """
+        with self.lock:
+            self.trial = False
+
+    def record(self, success):
+        """
+        Records result of allowed call.
+
+        :type success: bool
+        """
+        with self.lock:
+            if self.opened_at is not None:
+                # Calls started before the circuit opened don't decide.
+                if self.trial:
+                    self.trial = False
+                    self.opened_at = None if success else time.monotonic()
+                return
+
+            self.results.append(success)
+            failures = self.results.count(False)
+            if len(
+                self.results
+            ) == self.results.maxlen and failures >= self.failure_rate * len(
+                self.results
+            ):
+                self.opened_at = time.monotonic()
+                self.results.clear()
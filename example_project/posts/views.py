@@ -1,5 +1,7 @@
 from django.views.generic import DetailView, ListView
 
+from embed_video.fields import prefetch_videos
+
 from .models import Post
 
 
@@ -7,6 +9,11 @@ class PostListView(ListView):
     model = Post
     paginate_by = 10
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        prefetch_videos(context["object_list"], "video", thumbnails=True)
+        return context
+
 
 class PostDetailView(DetailView):
     model = Post
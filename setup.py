@@ -5,7 +5,9 @@ from setuptools import find_packages, setup
 setup(
     name="django-embed-video",
     packages=find_packages(),
-    package_data={"embed_video": ["templates/embed_video/*.html"]},
+    package_data={
+        "embed_video": ["templates/embed_video/*.html", "static/embed_video/*"]
+    },
     use_scm_version=True,
     author="Cedric Carrard",
     author_email="cedric.carrard@gmail.com",